@@ -1,16 +1,25 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.patches import Polygon
+import pandas as pd
 import pygame
 from wing_model import WingModel
 from data_processor import DataProcessor
+from simulation_results import SimulationResults
+from sweep_campaign import SweepCampaign
+from lattice_boltzmann import LatticeBoltzmannSolver
+from streamline_tracer import StreamlineTracer
+from results_database import ResultsDatabase
+from sensitivity_analysis import SensitivityAnalysis
+from aircraft_performance import AircraftPerformance
+from surrogate_model import ForceSurrogate
 from visualization import AerodynamicVisualizer
 from pathlib import Path
 import csv
-from airfoils import (
-    PlainFlap, SplitFlap, SlottedFlap, FowlerFlap,
-    DoubleSlottedFlap, TripleSlottedFlap, KruegerFlap,
-    LeadingEdgeSlat, ZapFlap, GougeFlap
-)
+import json
+from airfoils import FLAP_CONFIGURATIONS
+from airfoils.leading_edge_slat_flap import LeadingEdgeSlatFlap
 
 class AerodynamicSimulator:
     def __init__(self):
@@ -20,57 +29,177 @@ class AerodynamicSimulator:
         
         # Flap configurations
         self.flap_types = {
-            'Plain Flap': PlainFlap(),
-            'Split Flap': SplitFlap(),
-            'Slotted Flap': SlottedFlap(),
-            'Fowler Flap': FowlerFlap(),
-            'Double-Slotted Flap': DoubleSlottedFlap(),
-            'Triple-Slotted Flap': TripleSlottedFlap(),
-            'Krueger Flap': KruegerFlap(),
-            'Leading-Edge Slat': LeadingEdgeSlat(),
-            'Zap Flap': ZapFlap(),
-            'Gouge Flap': GougeFlap()
+            name: flap_class() for name, flap_class in FLAP_CONFIGURATIONS.items()
         }
         
         # Simulation parameters
         self.angles_of_attack = np.arange(-5, 20, 0.5)  # -5° to 20° in 0.5° steps
+        self.result_dtype = np.float64  # np.float32 halves memory for large studies
         
         # Create output directories
         self.output_dir = Path("output")
         self.plots_dir = self.output_dir / "plots"
         self.data_dir = self.output_dir / "data"
+        self.campaigns_dir = self.output_dir / "campaigns"
         
         for dir_path in [self.plots_dir, self.data_dir]:
             dir_path.mkdir(parents=True, exist_ok=True)
+        
+        # Record of the model parameters each saved polar was computed with
+        self.manifest_path = self.data_dir / 'manifest.json'
+        
+        # Indexed history of every run, queryable across studies
+        self.database = ResultsDatabase(self.output_dir / 'results.db')
+        
+        # A new database starts from the CSV results of earlier versions
+        if self.database.get_latest_run() is None:
+            self.database.ingest_csv_directory(self.data_dir)
     
     def run_simulation(self, flap_type, reynolds_number=1e6):
         """Run aerodynamic simulation for given flap configuration"""
-        lift_coefficients = []
-        drag_coefficients = []
-        
-        for angle in self.angles_of_attack:
-            lift, drag = self.wing_model.calculate_forces(
-                angle, 
-                flap_type,
-                reynolds_number
+        lift, drag = self.run_reynolds_sweep(flap_type, [reynolds_number])
+        return lift[0], drag[0]
+    
+    def run_reynolds_sweep(self, flap_type, reynolds_numbers):
+        """Run aerodynamic simulation over a range of Reynolds numbers"""
+        return self.wing_model.calculate_polars(
+            self.angles_of_attack,
+            flap_type,
+            reynolds_numbers
+        )
+    
+    def run_campaign(self, name, reynolds_numbers, geometries=None, chunk_size=100):
+        """Run a checkpointed sweep campaign that resumes from completed chunks"""
+        campaign = SweepCampaign(
+            self.wing_model,
+            self.angles_of_attack,
+            self.campaigns_dir / name,
+            self.flap_types,
+            reynolds_numbers,
+            geometries,
+            chunk_size
+        )
+        return campaign.run()
+    
+    def save_sweep_results(self, flap_type, reynolds_numbers, lift, drag):
+        """Save Reynolds sweep results to a CSV file in long format"""
+        reynolds_grid, angle_grid = np.meshgrid(
+            reynolds_numbers, self.angles_of_attack, indexing='ij'
+        )
+        data = {
+            'reynolds_number': reynolds_grid.ravel(),
+            'angle': angle_grid.ravel(),
+            'lift': lift.ravel(),
+            'drag': drag.ravel(),
+            'lift_to_drag': (lift/drag).ravel()
+        }
+        
+        csv_path = self.data_dir / f"{flap_type.replace(' ', '_').lower()}_reynolds_sweep.csv"
+        pd.DataFrame(data).to_csv(csv_path, index=False)
+    
+    def get_csv_path(self, flap_type):
+        """Get the CSV path for a flap configuration's results"""
+        return self.data_dir / f"{flap_type.replace(' ', '_').lower()}_results.csv"
+    
+    def load_results(self, flap_type):
+        """Load previously saved lift and drag coefficients from CSV"""
+        with open(self.get_csv_path(flap_type), newline='') as f:
+            rows = list(csv.DictReader(f))
+        lift = np.array([float(row['lift']) for row in rows])
+        drag = np.array([float(row['drag']) for row in rows])
+        return lift, drag
+    
+    def load_manifest(self):
+        """Load the manifest of saved results, discarding it if the angle grid changed"""
+        if not self.manifest_path.exists():
+            return {}
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get('angles') != self.angles_of_attack.tolist():
+            return {}
+        return manifest.get('flaps', {})
+    
+    def save_manifest(self, flap_manifest):
+        """Save the model parameters used for each flap's saved results"""
+        with open(self.manifest_path, 'w') as f:
+            json.dump({
+                'angles': self.angles_of_attack.tolist(),
+                'flaps': flap_manifest
+            }, f, indent=2)
+    
+    def find_stale_flaps(self, manifest, reynolds_number=1e6):
+        """Find flap types whose saved results are missing or out of date"""
+        stale = []
+        for flap_type in self.flap_types:
+            dependencies = self.wing_model.get_dependencies(flap_type, reynolds_number)
+            if (manifest.get(flap_type) != dependencies or
+                    not self.get_csv_path(flap_type).exists()):
+                stale.append(flap_type)
+        return stale
+    
+    def save_optimal_configs(self, optimal_configs):
+        """Merge updated optimal configuration rows into the saved table"""
+        csv_path = self.data_dir / 'optimal_configurations.csv'
+        if csv_path.exists():
+            saved = pd.read_csv(csv_path, index_col=0)
+            saved = saved.drop(index=optimal_configs.index, errors='ignore')
+            optimal_configs = pd.concat([saved, optimal_configs])
+        order = [flap for flap in self.flap_types if flap in optimal_configs.index]
+        optimal_configs.loc[order].to_csv(csv_path)
+    
+    def update_results(self, reynolds_number=1e6):
+        """Recompute and save only the results affected by changed model parameters"""
+        manifest = self.load_manifest()
+        stale = self.find_stale_flaps(manifest, reynolds_number)
+        
+        results = SimulationResults(
+            self.flap_types, self.angles_of_attack, self.result_dtype
+        )
+        for flap_type in self.flap_types:
+            if flap_type in stale:
+                lift, drag = self.run_simulation(flap_type, reynolds_number)
+            else:
+                lift, drag = self.load_results(flap_type)
+            results.set_results(flap_type, lift, drag)
+        
+        if stale:
+            # Process and analyze data
+            optimal_configs = self.data_processor.analyze_results(results, stale)
+            
+            # Save results and plots
+            self.save_results(results, stale)
+            self.plot_results(results)
+            self.save_optimal_configs(optimal_configs)
+            self.database.ingest_results(
+                results, reynolds_number,
+                description=f"Updated {', '.join(stale)}",
+                parameters={
+                    flap_type: self.wing_model.get_dependencies(flap_type, reynolds_number)
+                    for flap_type in self.flap_types
+                }
             )
-            lift_coefficients.append(lift)
-            drag_coefficients.append(drag)
             
-        return np.array(lift_coefficients), np.array(drag_coefficients)
+            for flap_type in stale:
+                manifest[flap_type] = self.wing_model.get_dependencies(
+                    flap_type, reynolds_number
+                )
+            self.save_manifest(manifest)
+        
+        return results
     
-    def save_results(self, results_dict):
+    def save_results(self, results, flap_types=None):
         """Save simulation results to CSV files"""
-        for flap_type, (lift, drag) in results_dict.items():
+        for flap_type in (flap_types if flap_types is not None else results):
+            row = results.get_row(flap_type)
             data = {
                 'angle': self.angles_of_attack,
-                'lift': lift,
-                'drag': drag,
-                'lift_to_drag': lift/drag
+                'lift': results.lift[row],
+                'drag': results.drag[row],
+                'lift_to_drag': results.lift_to_drag[row]
             }
             
             # Save to CSV
-            csv_path = self.data_dir / f"{flap_type.replace(' ', '_').lower()}_results.csv"
+            csv_path = self.get_csv_path(flap_type)
             with open(csv_path, 'w', newline='') as f:
                 writer = csv.DictWriter(f, fieldnames=data.keys())
                 writer.writeheader()
@@ -79,12 +208,12 @@ class AerodynamicSimulator:
                     for i in range(len(self.angles_of_attack))
                 )
     
-    def plot_results(self, results_dict):
+    def plot_results(self, results):
         """Plot and save lift-to-drag ratios for different flap configurations"""
         plt.figure(figsize=(12, 8))
         
-        for flap_type, (lift, drag) in results_dict.items():
-            lift_drag_ratio = lift / drag
+        for flap_type in results:
+            lift_drag_ratio = results.lift_to_drag[results.get_row(flap_type)]
             plt.plot(self.angles_of_attack, lift_drag_ratio, label=flap_type)
         
         plt.xlabel('Angle of Attack (degrees)')
@@ -98,22 +227,114 @@ class AerodynamicSimulator:
                    dpi=300, bbox_inches='tight')
         plt.close()
 
-    def main(self):
-        # Run simulations for different flap configurations
-        results = {}
+    def run_sensitivity_analysis(self, n_samples=10000):
+        """Compute Sobol sensitivity indices for every flap type and save them to CSV"""
+        analysis = SensitivityAnalysis(self.wing_model, self.angles_of_attack)
+        indices = pd.concat(
+            [analysis.analyze(flap_type, n_samples) for flap_type in self.flap_types],
+            ignore_index=True
+        )
+        indices.to_csv(self.data_dir / 'sensitivity_indices.csv', index=False)
+        return indices
+    
+    def run_performance_study(self, masses, altitudes, temperature_offsets,
+                              reynolds_number=1e6, performance=None):
+        """Compute stall/approach speeds and field lengths over an aircraft grid and save to CSV"""
+        results = SimulationResults(self.flap_types, self.angles_of_attack, self.result_dtype)
         for flap_type in self.flap_types:
-            lift, drag = self.run_simulation(flap_type)
-            results[flap_type] = (lift, drag)
+            results.set_results(flap_type, *self.run_simulation(flap_type, reynolds_number))
+        
+        performance = performance or AircraftPerformance(
+            wing_area=self.wing_model.chord_length * self.wing_model.wingspan
+        )
+        metrics = performance.calculate(results, masses, altitudes, temperature_offsets)
+        df = performance.to_dataframe(results, masses, altitudes, temperature_offsets, metrics)
+        df.to_csv(self.data_dir / 'field_performance.csv', index=False)
+        return metrics
+    
+    def train_surrogates(self, n_samples=2000):
+        """Train fast force model surrogates, save them and their validated error bounds"""
+        surrogate = ForceSurrogate(self.wing_model)
+        surrogate.train(self.flap_types, n_samples)
+        # Not one of the display configurations, so it gets its own name
+        surrogate.train_flap('Leading-Edge Slat Flap', LeadingEdgeSlatFlap(), n_samples)
+        surrogate.save(self.output_dir / 'surrogates')
+        
+        models = [(flap_type, 'wing', model) for flap_type, model in surrogate.models.items()]
+        models += [(flap_type, 'flap', model)
+                   for flap_type, (model, _) in surrogate.flap_models.items()]
+        records = [
+            {'flap_type': flap_type, 'source': source, 'output': output,
+             'terms': len(model.multi_indices), 'speedup': model.speedup,
+             'max_error': bounds['max'], 'rms_error': bounds['rms']}
+            for flap_type, source, model in models
+            for output, bounds in model.error_bounds.items()
+        ]
+        pd.DataFrame(records).to_csv(self.data_dir / 'surrogate_error_bounds.csv', index=False)
+        return surrogate
+    
+    def plot_flow_field(self, flap_type, flap_angle=np.radians(20), n_seeds=100,
+                        solver_steps=2000, grid_scale=3):
+        """Trace streamlines around a flap configuration and save the plot and field"""
+        # Flow domain around the airfoil, in pixels as used by get_flap_geometry
+        domain_width, domain_height = 600, 400
+        wing_points = self.flap_types[flap_type].get_flap_geometry(
+            domain_width // 2, domain_height // 2, flap_angle
+        )
+        
+        # Converge a lattice-Boltzmann flow field around the flap geometry
+        solver = LatticeBoltzmannSolver(domain_width // grid_scale, domain_height // grid_scale)
+        solver.set_obstacle(wing_points, grid_scale)
+        solver.step(solver_steps)
+        pressure_coefficient = solver.get_pressure_coefficient()
+        pressure_coefficient[solver.obstacle] = np.nan
         
-        # Process and analyze data
-        optimal_configs = self.data_processor.analyze_results(results)
+        # Trace all seeds from the inlet together
+        surface = wing_points / grid_scale
+        tracer = StreamlineTracer(
+            solver.velocity_x / solver.inlet_velocity,
+            solver.velocity_y / solver.inlet_velocity,
+            surface
+        )
+        seeds = np.column_stack((
+            np.full(n_seeds, 1.0),
+            np.linspace(1, solver.ny - 1, n_seeds)
+        ))
+        paths = tracer.trace(seeds)
         
-        # Save results and plots
-        self.save_results(results)
-        self.plot_results(results)
+        slug = flap_type.replace(' ', '_').lower()
+        np.savez_compressed(
+            self.data_dir / f"{slug}_flow_field.npz",
+            velocity_x=solver.velocity_x,
+            velocity_y=solver.velocity_y,
+            pressure_coefficient=pressure_coefficient,
+            obstacle=solver.obstacle,
+            grid_scale=grid_scale
+        )
         
-        # Save optimal configurations
-        optimal_configs.to_csv(self.data_dir / 'optimal_configurations.csv')
+        fig, ax = plt.subplots(figsize=(12, 8))
+        contour = ax.contourf(
+            np.arange(solver.nx) + 0.5, np.arange(solver.ny) + 0.5, pressure_coefficient,
+            levels=np.linspace(-1, 1, 21), cmap='coolwarm', extend='both'
+        )
+        fig.colorbar(contour, ax=ax, label='Pressure Coefficient')
+        ax.add_collection(LineCollection(
+            paths.transpose(1, 0, 2), colors='black', linewidths=0.5, alpha=0.7
+        ))
+        ax.add_patch(Polygon(surface, closed=True, color='dimgray'))
+        ax.set_xlim(0, solver.nx)
+        ax.set_ylim(solver.ny, 0)
+        ax.set_aspect('equal')
+        ax.set_title(f'Streamlines and Pressure: {flap_type}')
+        
+        # Save plot
+        fig.savefig(self.plots_dir / f'{slug}_streamlines.png',
+                    dpi=300, bbox_inches='tight')
+        plt.close(fig)
+    
+    def main(self):
+        # Run simulations for flap configurations whose inputs changed
+        self.update_results()
         
         # Launch interactive visualization
         self.visualizer.run_visualization(self.flap_types)
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+
+class StandardAtmosphere:
+    GAS_CONSTANT = 287.05  # J/(kg K)
+    GRAVITY = 9.80665      # m/s^2
+    
+    def __init__(self, max_altitude=20000, step=10):
+        # ISA troposphere to 11 km, isothermal stratosphere above, tabulated once
+        self.altitudes = np.arange(0, max_altitude + step, step, dtype=float)
+        lapse_rate = 0.0065
+        sea_level_temperature = 288.15
+        sea_level_pressure = 101325.0
+        tropopause = 11000.0
+        tropopause_temperature = sea_level_temperature - lapse_rate * tropopause
+        exponent = self.GRAVITY / (lapse_rate * self.GAS_CONSTANT)
+        
+        troposphere = self.altitudes <= tropopause
+        self.temperatures = np.where(
+            troposphere,
+            sea_level_temperature - lapse_rate * self.altitudes,
+            tropopause_temperature
+        )
+        tropopause_pressure = sea_level_pressure * (tropopause_temperature / sea_level_temperature)**exponent
+        self.pressures = np.where(
+            troposphere,
+            sea_level_pressure * (self.temperatures / sea_level_temperature)**exponent,
+            tropopause_pressure * np.exp(
+                -self.GRAVITY * (self.altitudes - tropopause) /
+                (self.GAS_CONSTANT * tropopause_temperature)
+            )
+        )
+        self.sea_level_density = sea_level_pressure / (self.GAS_CONSTANT * sea_level_temperature)
+    
+    def get_properties(self, altitude, temperature_offset=0.0):
+        """Interpolate temperature (K), pressure (Pa) and density (kg/m^3) at ISA + offset"""
+        temperature = np.interp(altitude, self.altitudes, self.temperatures) + temperature_offset
+        pressure = np.interp(altitude, self.altitudes, self.pressures)
+        density = pressure / (self.GAS_CONSTANT * temperature)
+        return temperature, pressure, density
+
+class AircraftPerformance:
+    def __init__(self, wing_area=20.0, sea_level_thrust=20000.0, rolling_friction=0.02,
+                 braking_friction=0.4, ground_angle=2.0, atmosphere=None):
+        self.wing_area = wing_area                # m^2
+        self.sea_level_thrust = sea_level_thrust  # N, scaled with density ratio
+        self.rolling_friction = rolling_friction
+        self.braking_friction = braking_friction
+        self.ground_angle = ground_angle          # degrees, attitude during ground roll
+        self.atmosphere = atmosphere if atmosphere is not None else StandardAtmosphere()
+    
+    def calculate(self, results, masses, altitudes, temperature_offsets):
+        """Calculate field performance over a (flap x mass x altitude x temperature) grid
+        
+        results is a SimulationResults; masses are in kg, altitudes in m and
+        temperature offsets in K from ISA. Returns a dict of arrays of that shape.
+        """
+        g = self.atmosphere.GRAVITY
+        
+        # Per-flap polar quantities, shaped (flaps, 1, 1, 1)
+        flap_shape = (-1, 1, 1, 1)
+        cl_max = results.lift.max(axis=1).reshape(flap_shape)
+        cl_ground = np.array([
+            np.interp(self.ground_angle, results.angles_of_attack, results.lift[i])
+            for i in range(len(results))
+        ]).reshape(flap_shape)
+        cd_ground = np.array([
+            np.interp(self.ground_angle, results.angles_of_attack, results.drag[i])
+            for i in range(len(results))
+        ]).reshape(flap_shape)
+        
+        # Atmosphere is evaluated once per (altitude, temperature) pair
+        altitudes = np.asarray(altitudes, dtype=float).reshape(1, 1, -1, 1)
+        temperature_offsets = np.asarray(temperature_offsets, dtype=float).reshape(1, 1, 1, -1)
+        _, _, density = self.atmosphere.get_properties(altitudes, temperature_offsets)
+        weight = g * np.asarray(masses, dtype=float).reshape(1, -1, 1, 1)
+        thrust = self.sea_level_thrust * density / self.atmosphere.sea_level_density
+        
+        stall_speed = np.sqrt(2 * weight / (density * self.wing_area * cl_max))
+        approach_speed = 1.3 * stall_speed
+        liftoff_speed = 1.1 * stall_speed
+        touchdown_speed = 1.15 * stall_speed
+        
+        # Forces averaged at 0.7 of liftoff / touchdown speed
+        q_takeoff = 0.5 * density * (0.7 * liftoff_speed)**2 * self.wing_area
+        q_landing = 0.5 * density * (0.7 * touchdown_speed)**2 * self.wing_area
+        takeoff_force = (thrust - q_takeoff * cd_ground -
+                         self.rolling_friction * (weight - q_takeoff * cl_ground))
+        landing_force = (q_landing * cd_ground +
+                         self.braking_friction * (weight - q_landing * cl_ground))
+        
+        # Without a net accelerating / decelerating force the roll never ends
+        mass = weight / g
+        takeoff_distance = np.where(
+            takeoff_force > 0, mass * liftoff_speed**2 / (2 * takeoff_force), np.inf
+        )
+        landing_distance = np.where(
+            landing_force > 0, mass * touchdown_speed**2 / (2 * landing_force), np.inf
+        )
+        
+        shape = np.broadcast_shapes(
+            cl_max.shape, weight.shape, altitudes.shape, temperature_offsets.shape
+        )
+        return {
+            'stall_speed': np.broadcast_to(stall_speed, shape),
+            'approach_speed': np.broadcast_to(approach_speed, shape),
+            'takeoff_distance': np.broadcast_to(takeoff_distance, shape),
+            'landing_distance': np.broadcast_to(landing_distance, shape)
+        }
+    
+    def to_dataframe(self, results, masses, altitudes, temperature_offsets, metrics):
+        """Flatten a grid of metrics into a long-format DataFrame"""
+        index = pd.MultiIndex.from_product(
+            [list(results), masses, altitudes, temperature_offsets],
+            names=['flap_type', 'mass', 'altitude', 'temperature_offset']
+        )
+        return pd.DataFrame(
+            {name: values.ravel() for name, values in metrics.items()}, index=index
+        ).reset_index()
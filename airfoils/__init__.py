@@ -10,7 +10,22 @@ from .leading_edge_slat import LeadingEdgeSlat
 from .zap_flap import ZapFlap
 from .gouge_flap import GougeFlap
 
+# Flap configuration classes by display name
+FLAP_CONFIGURATIONS = {
+    'Plain Flap': PlainFlap,
+    'Split Flap': SplitFlap,
+    'Slotted Flap': SlottedFlap,
+    'Fowler Flap': FowlerFlap,
+    'Double-Slotted Flap': DoubleSlottedFlap,
+    'Triple-Slotted Flap': TripleSlottedFlap,
+    'Krueger Flap': KruegerFlap,
+    'Leading-Edge Slat': LeadingEdgeSlat,
+    'Zap Flap': ZapFlap,
+    'Gouge Flap': GougeFlap
+}
+
 __all__ = [
+    'FLAP_CONFIGURATIONS',
     'BaseAirfoil',
     'PlainFlap',
     'SplitFlap',
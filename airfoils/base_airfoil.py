@@ -4,7 +4,7 @@ class BaseAirfoil:
     def __init__(self, chord=200, thickness=30):
         self.chord = chord
         self.thickness = thickness
-        
+    
     def naca0012(self, x):
         """Generate NACA 0012 airfoil coordinates"""
         y = self.thickness * (0.2969 * np.sqrt(x/self.chord) - 
@@ -13,37 +13,56 @@ class BaseAirfoil:
                             0.2843 * (x/self.chord)**3 - 
                             0.1015 * (x/self.chord)**4)
         return y
-
+    
     def get_profile_points(self, center_x, center_y):
         """Get base airfoil profile points"""
         x_coords = np.linspace(0, self.chord, 50)
         y_coords = self.naca0012(x_coords)
+        x = center_x - self.chord/2 + x_coords
         
-        points = []
-        # Upper surface
-        for i in range(len(x_coords)):
-            x = center_x - self.chord/2 + x_coords[i]
-            points.append([x, center_y - y_coords[i]])
+        # Upper surface, then lower surface in reverse order
+        upper = np.column_stack((x, center_y - y_coords))
+        lower = np.column_stack((x[::-1], center_y + y_coords[::-1]))
+        return np.vstack((upper, lower))
+    
+    def transform_points(self, points, pivots, angles, offsets=0.0):
+        """Translate by offsets, then rotate about pivots, for a batch of angles at once
         
-        # Lower surface (reverse order)
-        for i in range(len(x_coords)-1, -1, -1):
-            x = center_x - self.chord/2 + x_coords[i]
-            points.append([x, center_y + y_coords[i]])
-            
-        return np.array(points)
-
+        points is (P, 2) or (N, P, 2); pivots and offsets are (2,) or (N, 2); angles is
+        a scalar or (N,). Returns (N, P, 2), or (P, 2) for a scalar angle.
+        """
+        angles = np.asarray(angles, dtype=float)
+        flat_angles = angles.reshape(-1)
+        cos_theta = np.cos(flat_angles)
+        sin_theta = np.sin(flat_angles)
+        
+        # (N, 2, 2) rotation matrices, transposed for row-vector points
+        rotations_t = np.empty((len(flat_angles), 2, 2))
+        rotations_t[:, 0, 0] = cos_theta
+        rotations_t[:, 0, 1] = sin_theta
+        rotations_t[:, 1, 0] = -sin_theta
+        rotations_t[:, 1, 1] = cos_theta
+        
+        pivots = np.asarray(pivots, dtype=float).reshape(-1, 1, 2)
+        offsets = np.asarray(offsets, dtype=float)
+        if offsets.ndim:
+            offsets = offsets.reshape(-1, 1, 2)
+        
+        translated = np.asarray(points, dtype=float) + offsets - pivots
+        transformed = np.matmul(translated, rotations_t) + pivots
+        
+        if angles.ndim == 0 and transformed.shape[0] == 1:
+            return transformed[0]
+        return transformed
+    
     def rotate_points(self, points, pivot, angle):
         """Rotate points around a pivot point"""
-        if not isinstance(points, np.ndarray):
-            points = np.array(points)
-        if not isinstance(pivot, np.ndarray):
-            pivot = np.array(pivot)
-            
-        translated = points - pivot
-        rotation_matrix = np.array([
-            [np.cos(angle), -np.sin(angle)],
-            [np.sin(angle), np.cos(angle)]
-        ])
-        
-        rotated = np.dot(translated, rotation_matrix.T)
-        return rotated + pivot
\ No newline at end of file
+        return self.transform_points(points, pivot, angle)
+    
+    def stack_elements(self, *elements):
+        """Join element point arrays, broadcasting fixed elements across a batch of angles"""
+        batch_shape = max((element.shape[:-2] for element in elements), key=len)
+        return np.concatenate([
+            np.broadcast_to(element, batch_shape + element.shape[-2:])
+            for element in elements
+        ], axis=-2)
@@ -18,17 +18,17 @@ class DoubleSlottedFlap(BaseAirfoil):
         hinge1_x = center_x + self.chord * 0.2
         hinge1_y = center_y + self.gap1
         flap1_points = flap1.get_profile_points(hinge1_x, hinge1_y)
-        rotated_flap1 = self.rotate_points(flap1_points, 
-                                         np.array([hinge1_x, hinge1_y]), 
-                                         flap_angle * 0.7)  # First flap deflects less
+        rotated_flap1 = self.transform_points(flap1_points, 
+                                              np.array([hinge1_x, hinge1_y]), 
+                                              np.multiply(flap_angle, 0.7))  # First flap deflects less
         
         # Second flap element
         flap2 = BaseAirfoil(self.flap2_chord, self.thickness * 0.7)
         hinge2_x = center_x + self.chord * 0.4
         hinge2_y = center_y + self.gap2
         flap2_points = flap2.get_profile_points(hinge2_x, hinge2_y)
-        rotated_flap2 = self.rotate_points(flap2_points, 
-                                         np.array([hinge2_x, hinge2_y]), 
-                                         flap_angle)
+        rotated_flap2 = self.transform_points(flap2_points, 
+                                              np.array([hinge2_x, hinge2_y]), 
+                                              flap_angle)
         
-        return np.vstack((base_points[:-10], rotated_flap1, rotated_flap2)) 
\ No newline at end of file
+        return self.stack_elements(base_points[:-10], rotated_flap1, rotated_flap2) 
\ No newline at end of file
@@ -9,15 +9,7 @@ class FlapConfigurations:
         
     def rotate_points(self, points, pivot, angle):
         """Rotate points around a pivot point"""
-        cos_theta = np.cos(angle)
-        sin_theta = np.sin(angle)
-        
-        translated = points - pivot
-        rotated = np.zeros_like(points)
-        rotated[:, 0] = translated[:, 0] * cos_theta - translated[:, 1] * sin_theta
-        rotated[:, 1] = translated[:, 0] * sin_theta + translated[:, 1] * cos_theta
-        
-        return rotated + pivot
+        return self.base_airfoil.transform_points(points, pivot, angle)
 
     def plain_flap(self, center_x, center_y, flap_angle):
         """Generate plain flap configuration"""
@@ -25,7 +17,7 @@ class FlapConfigurations:
         hinge_x = center_x + self.chord * 0.2
         hinge_point = np.array([hinge_x, center_y])
         flap_points = self.rotate_points(base_points[-20:], hinge_point, flap_angle)
-        return np.vstack((base_points[:-20], flap_points))
+        return self.base_airfoil.stack_elements(base_points[:-20], flap_points)
 
     def split_flap(self, center_x, center_y, flap_angle):
         """Generate split flap configuration"""
@@ -36,7 +28,7 @@ class FlapConfigurations:
         
         lower_points = base_points[mid_point:]
         flap_points = self.rotate_points(lower_points[-15:], hinge_point, flap_angle)
-        return np.vstack((base_points[:-15], flap_points))
+        return self.base_airfoil.stack_elements(base_points[:-15], flap_points)
 
     def slotted_flap(self, center_x, center_y, flap_angle):
         """Generate slotted flap configuration"""
@@ -55,6 +47,6 @@ class FlapConfigurations:
                                        np.array([hinge_x, hinge_y]), 
                                        flap_angle)
         
-        return np.vstack((base_points[:-10], flap_points))
+        return self.base_airfoil.stack_elements(base_points[:-10], flap_points)
 
     # Add other flap configurations similarly... 
\ No newline at end of file
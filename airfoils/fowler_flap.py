@@ -16,8 +16,8 @@ class FowlerFlap(BaseAirfoil):
         hinge_x = center_x + self.chord * 0.2 + self.extension
         hinge_y = center_y + self.gap
         flap_points = flap.get_profile_points(hinge_x, hinge_y)
-        rotated_flap = self.rotate_points(flap_points, 
-                                        np.array([hinge_x, hinge_y]), 
-                                        flap_angle)
+        rotated_flap = self.transform_points(flap_points, 
+                                             np.array([hinge_x, hinge_y]), 
+                                             flap_angle)
         
-        return np.vstack((base_points, rotated_flap))
\ No newline at end of file
+        return self.stack_elements(base_points, rotated_flap)
\ No newline at end of file
@@ -18,10 +18,13 @@ class GougeFlap(BaseAirfoil):
         # Special deployment characteristics
         deploy_x = center_x + self.chord * 0.15 + self.extension
         deploy_y = center_y + self.gap * (1 + np.sin(flap_angle))
+        deploy_point = np.stack(np.broadcast_arrays(deploy_x, deploy_y), axis=-1)
         
-        flap_points = flap.get_profile_points(deploy_x, deploy_y)
-        rotated_flap = self.rotate_points(flap_points, 
-                                        np.array([deploy_x, deploy_y]), 
-                                        flap_angle * 1.1)
+        # Move the flap profile to each deployment position, then rotate it in place
+        flap_points = flap.get_profile_points(0, 0)
+        rotated_flap = self.transform_points(flap_points, 
+                                             deploy_point, 
+                                             np.multiply(flap_angle, 1.1),
+                                             offsets=deploy_point)
         
-        return np.vstack((base_points[:-12], rotated_flap)) 
\ No newline at end of file
+        return self.stack_elements(base_points[:-12], rotated_flap) 
\ No newline at end of file
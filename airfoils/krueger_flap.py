@@ -18,13 +18,16 @@ class KruegerFlap(BaseAirfoil):
         hinge_y = center_y + self.thickness * 0.3
         
         # Generate deployment path
-        theta = flap_angle * 1.5  # Larger rotation for Krueger
+        theta = np.multiply(flap_angle, 1.5)  # Larger rotation for Krueger
         deploy_x = hinge_x - self.deployment_radius * np.sin(theta)
         deploy_y = hinge_y - self.deployment_radius * (1 - np.cos(theta))
+        deploy_point = np.stack((deploy_x, deploy_y), axis=-1)
         
-        flap_points = flap.get_profile_points(deploy_x, deploy_y)
-        rotated_flap = self.rotate_points(flap_points, 
-                                        np.array([hinge_x, hinge_y]), 
-                                        -theta)  # Negative angle for upward deployment
+        # Move the flap profile along the deployment path, then rotate about the hinge
+        flap_points = flap.get_profile_points(0, 0)
+        rotated_flap = self.transform_points(flap_points, 
+                                             np.array([hinge_x, hinge_y]), 
+                                             -theta,  # Negative angle for upward deployment
+                                             offsets=deploy_point)
         
-        return np.vstack((rotated_flap, base_points)) 
\ No newline at end of file
+        return self.stack_elements(rotated_flap, base_points) 
\ No newline at end of file
@@ -38,8 +38,8 @@ class LeadingEdgeSlatFlap(BaseAirfoil):
         slat_y = center_y - self.slat_gap
         
         slat_points = slat.get_profile_points(slat_x, slat_y)
-        rotated_slat = self.rotate_points(slat_points, 
-                                        np.array([slat_x + self.slat_chord/2, slat_y]), 
-                                        -flap_angle * 0.3)  # Smaller angle for slat
+        rotated_slat = self.transform_points(slat_points, 
+                                             np.array([slat_x + self.slat_chord/2, slat_y]), 
+                                             np.multiply(flap_angle, -0.3))  # Smaller angle for slat
         
-        return np.vstack((rotated_slat, base_points))
\ No newline at end of file
+        return self.stack_elements(rotated_slat, base_points)
\ No newline at end of file
@@ -14,16 +14,6 @@ class PlainFlap(BaseAirfoil):
         
         # Rotate the flap portion
         flap_points = base_points[-20:]
-        rotated_flap = self.rotate_points(flap_points, hinge_point, flap_angle)
+        rotated_flap = self.transform_points(flap_points, hinge_point, flap_angle)
         
-        return np.vstack((base_points[:-20], rotated_flap))
-
-    def rotate_points(self, points, pivot, angle):
-        """Rotate points around a pivot point"""
-        translated = points - pivot
-        rotation_matrix = np.array([
-            [np.cos(angle), -np.sin(angle)],
-            [np.sin(angle), np.cos(angle)]
-        ])
-        rotated = np.dot(translated, rotation_matrix.T)
-        return rotated + pivot
\ No newline at end of file
+        return self.stack_elements(base_points[:-20], rotated_flap)
@@ -17,8 +17,8 @@ class SlottedFlap(BaseAirfoil):
         hinge_x = center_x + self.chord * 0.2
         hinge_y = center_y + self.slot_gap
         flap_points = flap.get_profile_points(hinge_x, hinge_y)
-        rotated_flap = self.rotate_points(flap_points, 
-                                        np.array([hinge_x, hinge_y]), 
-                                        flap_angle)
+        rotated_flap = self.transform_points(flap_points, 
+                                             np.array([hinge_x, hinge_y]), 
+                                             flap_angle)
         
-        return np.vstack((base_points[:-10], rotated_flap))
\ No newline at end of file
+        return self.stack_elements(base_points[:-10], rotated_flap)
\ No newline at end of file
@@ -15,6 +15,6 @@ class SplitFlap(BaseAirfoil):
         
         # Only rotate lower surface
         lower_points = base_points[mid_point:][-15:]
-        rotated_flap = self.rotate_points(lower_points, hinge_point, flap_angle)
+        rotated_flap = self.transform_points(lower_points, hinge_point, flap_angle)
         
-        return np.vstack((base_points[:-15], rotated_flap))
\ No newline at end of file
+        return self.stack_elements(base_points[:-15], rotated_flap)
\ No newline at end of file
@@ -19,10 +19,10 @@ class TripleSlottedFlap(BaseAirfoil):
             hinge_y = center_y + self.gaps[i]
             points = flap.get_profile_points(hinge_x, hinge_y)
             # Each subsequent flap deflects more
-            deflection = flap_angle * (0.6 + i * 0.2)
-            rotated = self.rotate_points(points, 
-                                       np.array([hinge_x, hinge_y]), 
-                                       deflection)
+            deflection = np.multiply(flap_angle, 0.6 + i * 0.2)
+            rotated = self.transform_points(points, 
+                                            np.array([hinge_x, hinge_y]), 
+                                            deflection)
             flap_points.append(rotated)
         
-        return np.vstack([base_points[:-10]] + flap_points) 
\ No newline at end of file
+        return self.stack_elements(base_points[:-10], *flap_points) 
\ No newline at end of file
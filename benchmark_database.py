@@ -0,0 +1,68 @@
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+from results_database import ResultsDatabase
+from wing_model import WingModel
+from airfoils import FLAP_CONFIGURATIONS
+
+def build_database(db_path, n_reynolds=2000, n_angles=50):
+    """Fill a database with one sweep per flap type, n_reynolds x n_angles rows each"""
+    database = ResultsDatabase(db_path)
+    wing_model = WingModel()
+    reynolds_numbers = np.logspace(5, 8, n_reynolds)
+    angles = np.linspace(-5, 20, n_angles)
+    for flap_type in FLAP_CONFIGURATIONS:
+        lift, drag = wing_model.calculate_polars(angles, flap_type, reynolds_numbers)
+        database.ingest_sweep(flap_type, reynolds_numbers, angles, lift, drag)
+    return database
+
+def time_query(database, repeats=5, **kwargs):
+    """Run top_lift_to_drag repeatedly, returning the result and the fastest time in ms"""
+    best = np.inf
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        result = database.top_lift_to_drag(**kwargs)
+        best = min(best, time.perf_counter() - start_time)
+    return result, best * 1000
+
+def main():
+    ranges = [
+        (1e5, 1e8),    # everything
+        (1e5, 1e7),    # wide, excluding the best polars
+        (1e7, 1e8),    # wide, holding the best polars
+        (1e5, 2e5),    # narrow, poor polars only
+        (5e5, 5.01e5)  # a single Reynolds number
+    ]
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        start_time = time.perf_counter()
+        database = build_database(Path(temp_dir) / "benchmark.db")
+        rows = database.connection.execute("SELECT COUNT(*) FROM polars").fetchone()[0]
+        print(f"Ingested {rows} rows in {time.perf_counter() - start_time:.1f}s")
+    
+        slowest = 0.0
+        for flap_type in [None, 'Fowler Flap']:
+            for reynolds_min, reynolds_max in ranges:
+                top, elapsed = time_query(
+                    database, n=10, reynolds_min=reynolds_min,
+                    reynolds_max=reynolds_max, flap_type=flap_type
+                )
+    
+                # Check against a full scan that ignores the indexes
+                expected = database.connection.execute(
+                    "SELECT lift_to_drag FROM polars NOT INDEXED "
+                    "WHERE reynolds_number BETWEEN ? AND ? AND (? IS NULL OR flap_type = ?) "
+                    "ORDER BY lift_to_drag DESC LIMIT 10",
+                    (reynolds_min, reynolds_max, flap_type, flap_type)
+                ).fetchall()
+                slowest = max(slowest, elapsed)
+                correct = np.array_equal(top['lift_to_drag'], [row[0] for row in expected])
+                print(f"Top 10 L/D, Re {reynolds_min:.3g}-{reynolds_max:.3g}, "
+                      f"{flap_type or 'all flaps'}: {elapsed:.2f} ms"
+                      f"{'' if correct else ' (MISMATCH)'}")
+        print(f"Slowest query: {slowest:.2f} ms")
+        database.close()
+
+if __name__ == "__main__":
+    main()
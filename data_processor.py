@@ -1,24 +1,53 @@
 import numpy as np
 import pandas as pd
+from simulation_results import SimulationResults
 
 class DataProcessor:
-    def analyze_results(self, results_dict):
+    def load_results(self, database, run_id=None, reynolds_number=None):
+        """Load one run's polars from the results database (latest run by default)
+        
+        Runs holding several Reynolds numbers need reynolds_number to pick one.
+        """
+        polars = database.get_polars(run_id)
+        if reynolds_number is not None:
+            polars = polars[polars['reynolds_number'] == reynolds_number]
+        elif polars['reynolds_number'].nunique() > 1:
+            raise ValueError(
+                f"Run {run_id if run_id is not None else database.get_latest_run()} "
+                "holds several Reynolds numbers; pass reynolds_number to select one"
+            )
+        return self.polars_to_results(polars)
+    
+    def polars_to_results(self, polars):
+        """Build a SimulationResults from polar rows at a single Reynolds number"""
+        flap_types = list(dict.fromkeys(polars['flap_type']))
+        angles = np.sort(polars['angle'].unique())
+        results = SimulationResults(flap_types, angles)
+        for flap_type, rows in polars.groupby('flap_type', sort=False):
+            rows = rows.sort_values('angle')
+            results.set_results(flap_type, rows['lift'].to_numpy(), rows['drag'].to_numpy())
+        return results
+    
+    def analyze_results(self, results, flap_types=None):
         """Analyze simulation results to find optimal configurations"""
         optimal_configs = {}
         
-        for wing_shape, (lift, drag) in results_dict.items():
-            # Calculate lift-to-drag ratio
-            lift_drag_ratio = lift / drag
+        # Lift-to-drag ratios and their maxima are cached on the results
+        lift_drag_ratio = results.lift_to_drag
+        optimal_indices = results.optimal_indices
+        
+        for wing_shape in (flap_types if flap_types is not None else results):
+            row = results.get_row(wing_shape)
             
             # Find optimal angle of attack
-            optimal_idx = np.argmax(lift_drag_ratio)
+            optimal_idx = optimal_indices[row]
             optimal_configs[wing_shape] = {
                 'optimal_angle': optimal_idx,
-                'max_lift_drag_ratio': lift_drag_ratio[optimal_idx],
-                'lift_coefficient': lift[optimal_idx],
-                'drag_coefficient': drag[optimal_idx]
+                'max_lift_drag_ratio': lift_drag_ratio[row, optimal_idx],
+                'lift_coefficient': results.lift[row, optimal_idx],
+                'drag_coefficient': results.drag[row, optimal_idx]
             }
             
         # Convert to pandas DataFrame for easy analysis
         df = pd.DataFrame.from_dict(optimal_configs, orient='index')
-        return df 
\ No newline at end of file
+        return df
@@ -1,6 +1,8 @@
 import pandas as pd
 from pathlib import Path
 import re
+from results_database import ResultsDatabase, normalize_flap_name
+from data_processor import DataProcessor
 
 def clean_column_name(name):
     """Convert column names to LaTeX-friendly format"""
@@ -17,12 +19,47 @@ def csv_to_latex(csv_path, output_dir):
     # Get flap type from filename
     flap_type = csv_path.stem.replace('_', ' ').title()
     
+    dataframe_to_latex(df, flap_type, csv_path.stem, output_dir)
+
+def database_to_latex(db_path, output_dir, reynolds_number=1e6):
+    """Convert the latest polar of each flap type at one Reynolds number to LaTeX tables
+    
+    Returns the flap types written, which is empty when the database holds no
+    polars at that Reynolds number.
+    """
+    database = ResultsDatabase(db_path)
+    polars = database.get_latest_polars(reynolds_number)
+    database.close()
+    if polars.empty:
+        return []
+    
+    processor = DataProcessor()
+    results = processor.polars_to_results(polars)
+    for flap_type in results:
+        row = results.get_row(flap_type)
+        df = pd.DataFrame({
+            'angle': results.angles_of_attack,
+            'lift': results.lift[row],
+            'drag': results.drag[row],
+            'lift_to_drag': results.lift_to_drag[row]
+        })
+        name = f"{flap_type.replace(' ', '_').lower()}_results"
+        dataframe_to_latex(df, flap_type, name, output_dir)
+        print(f"Generated LaTeX table for {flap_type}")
+    
+    optimal_configs = processor.analyze_results(results).rename_axis('flap_type').reset_index()
+    dataframe_to_latex(optimal_configs, "Optimal Configurations", "optimal_configurations", output_dir)
+    print("Generated LaTeX table for optimal configurations")
+    return list(results)
+
+def dataframe_to_latex(df, flap_type, name, output_dir):
+    """Write a DataFrame of aerodynamic data as a LaTeX table"""
     # Create LaTeX table content
     latex_content = [
         "\\begin{table}[h!]",
         "\\centering",
         "\\caption{Aerodynamic Data for " + flap_type + "}",
-        "\\label{tab:" + csv_path.stem + "}",
+        "\\label{tab:" + name + "}",
         "\\begin{tabular}{" + "c" * len(df.columns) + "}",
         "\\hline"
     ]
@@ -45,7 +82,7 @@ def csv_to_latex(csv_path, output_dir):
     ])
     
     # Write to file
-    output_path = output_dir / f"{csv_path.stem}_table.tex"
+    output_path = output_dir / f"{name}_table.tex"
     with open(output_path, 'w') as f:
         f.write('\n'.join(latex_content))
 
@@ -54,13 +91,23 @@ def main():
     output_dir = Path("output/tables")
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Process all CSV files in the data directory
+    # Prefer the results database, with CSV files covering whatever it lacks
+    db_path = Path("output/results.db")
     data_dir = Path("output/data")
+    flap_types = database_to_latex(db_path, output_dir) if db_path.exists() else []
     if data_dir.exists():
-        for csv_file in data_dir.glob("*.csv"):
+        # Only polar and optimal configuration tables; other outputs are too large
+        stored = {normalize_flap_name(flap_type) for flap_type in flap_types}
+        csv_files = [
+            csv_file for csv_file in sorted(data_dir.glob("*_results.csv"))
+            if normalize_flap_name(csv_file.stem[:-len("_results")]) not in stored
+        ]
+        if not flap_types:
+            csv_files += sorted(data_dir.glob("optimal_configurations.csv"))
+        for csv_file in csv_files:
             csv_to_latex(csv_file, output_dir)
             print(f"Generated LaTeX table for {csv_file.name}")
-    else:
+    elif not flap_types:
         print("No data directory found. Please run the simulator first to generate CSV files.")
 
 if __name__ == "__main__":
@@ -0,0 +1,121 @@
+import os
+
+# Render without a display; must be set before pygame is initialised
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from visualization import AerodynamicVisualizer
+from airfoils import FLAP_CONFIGURATIONS
+
+def create_visualizer(flap_type, width, height):
+    """Set up a headless visualizer showing one flap type"""
+    visualizer = AerodynamicVisualizer(width, height)
+    flap_types = {name: flap_class() for name, flap_class in FLAP_CONFIGURATIONS.items()}
+    visualizer.prepare_scene(flap_types)
+    visualizer.current_flap = flap_types[flap_type]
+    return visualizer
+
+def simulate_checkpoints(flap_type, starts, width, height):
+    """Simulate one flap type's animation once, saving the state at each chunk start"""
+    visualizer = create_visualizer(flap_type, width, height)
+    checkpoints = {}
+    for frame in range(max(starts) + 1):
+        if frame in starts:
+            checkpoints[frame] = visualizer.get_simulation_state()
+        visualizer.update_scene(visualizer.get_substeps())
+        visualizer.advance_animation()
+    pygame.quit()
+    return checkpoints
+
+def render_chunk(flap_type, start, stop, width, height, output_dir, image_format, state):
+    """Render frames [start, stop) of one flap type's animation in a worker process
+    
+    state is the simulation state at frame start, from simulate_checkpoints.
+    """
+    visualizer = create_visualizer(flap_type, width, height)
+    visualizer.set_simulation_state(state)
+    
+    flap_dir = Path(output_dir) / flap_type.replace(' ', '_').lower()
+    flap_dir.mkdir(parents=True, exist_ok=True)
+    
+    raw_file = None
+    if image_format == 'raw':
+        raw_file = open(flap_dir / f"frames_{start:06d}-{stop:06d}.rgb", 'wb')
+    
+    for frame in range(start, stop):
+        visualizer.step_simulation()
+        visualizer.render_frame()
+        if raw_file is not None:
+            # Rows of RGB24 pixels, ready for a rawvideo encoder
+            pixels = pygame.surfarray.pixels3d(visualizer.screen)
+            raw_file.write(np.ascontiguousarray(pixels.transpose(1, 0, 2)).tobytes())
+            del pixels
+        else:
+            pygame.image.save(visualizer.screen, str(flap_dir / f"frame_{frame:06d}.png"))
+    
+    if raw_file is not None:
+        raw_file.close()
+    pygame.quit()
+    return stop - start
+
+class OfflineRenderer:
+    def __init__(self, output_dir="output/frames", width=1920, height=1080,
+                 image_format='png', workers=None):
+        self.output_dir = Path(output_dir)
+        self.width = width
+        self.height = height
+        self.image_format = image_format  # 'png' or 'raw'
+        self.workers = workers or os.cpu_count()
+        
+        if image_format not in ('png', 'raw'):
+            raise ValueError(f"Unknown image format: {image_format}")
+    
+    def get_tasks(self, flap_types, n_frames, chunk_frames):
+        """Split each flap type's animation into frame ranges"""
+        tasks = []
+        for flap_type in flap_types:
+            for start in range(0, n_frames, chunk_frames):
+                stop = min(start + chunk_frames, n_frames)
+                tasks.append((flap_type, start, stop))
+        return tasks
+    
+    def render(self, flap_types=None, n_frames=360, chunk_frames=120):
+        """Render animations for the given flap types across worker processes
+        
+        Raw output is written as RGB24 chunks per flap type, which can be joined
+        in order and encoded with e.g.
+        ffmpeg -f rawvideo -pix_fmt rgb24 -s WIDTHxHEIGHT -r 60 -i frames.rgb out.mp4
+        """
+        flap_types = list(flap_types or FLAP_CONFIGURATIONS)
+        tasks = self.get_tasks(flap_types, n_frames, chunk_frames)
+        
+        start_time = time.perf_counter()
+        with ProcessPoolExecutor(self.workers) as pool:
+            # Particle state depends on every earlier frame, so simulate each flap
+            # type through once and start every chunk from its saved state
+            starts = {flap_type: [] for flap_type in flap_types}
+            for flap_type, start, _ in tasks:
+                starts[flap_type].append(start)
+            checkpoints = dict(zip(flap_types, pool.map(
+                simulate_checkpoints, flap_types, [starts[flap_type] for flap_type in flap_types],
+                [self.width] * len(flap_types), [self.height] * len(flap_types)
+            )))
+            
+            futures = [
+                pool.submit(render_chunk, flap_type, start, stop, self.width,
+                            self.height, self.output_dir, self.image_format,
+                            checkpoints[flap_type][start])
+                for flap_type, start, stop in tasks
+            ]
+            rendered = sum(future.result() for future in futures)
+        
+        elapsed = time.perf_counter() - start_time
+        print(f"Rendered {rendered} frames in {elapsed:.1f}s ({rendered / elapsed:.1f} FPS)")
+        return rendered
+
+if __name__ == "__main__":
+    OfflineRenderer().render()
@@ -0,0 +1,229 @@
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from airfoils import FLAP_CONFIGURATIONS
+
+def normalize_flap_name(name):
+    """Normalize a flap name or file stem, e.g. 'leading_edge_slat_flap', for matching"""
+    name = name.lower().replace('-', ' ').replace('_', ' ')
+    return name[:-len(' flap')] if name.endswith(' flap') else name
+
+class ResultsDatabase:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created TEXT NOT NULL,
+            description TEXT,
+            parameters TEXT
+        );
+        CREATE TABLE IF NOT EXISTS polars (
+            run_id INTEGER NOT NULL REFERENCES runs(run_id),
+            flap_type TEXT NOT NULL,
+            reynolds_number REAL,
+            angle REAL NOT NULL,
+            lift REAL NOT NULL,
+            drag REAL NOT NULL,
+            lift_to_drag REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_polars_run ON polars(run_id);
+        CREATE INDEX IF NOT EXISTS idx_polars_reynolds ON polars(reynolds_number);
+        CREATE INDEX IF NOT EXISTS idx_polars_angle ON polars(angle);
+        CREATE INDEX IF NOT EXISTS idx_polars_lift_to_drag ON polars(lift_to_drag);
+        
+        -- Flap type index extended so ranked queries can seek (flap, Re, L/D ranges)
+        DROP INDEX IF EXISTS idx_polars_flap;
+        CREATE INDEX IF NOT EXISTS idx_polars_flap_reynolds_lift_to_drag
+            ON polars(flap_type, reynolds_number, lift_to_drag);
+        
+        -- Best lift-to-drag of each (flap type, Reynolds number) across all runs
+        CREATE TABLE IF NOT EXISTS polar_maxima (
+            flap_type TEXT NOT NULL,
+            reynolds_number REAL NOT NULL,
+            max_lift_to_drag REAL NOT NULL,
+            PRIMARY KEY (reynolds_number, flap_type)
+        ) WITHOUT ROWID;
+    """
+    
+    def __init__(self, db_path="output/results.db"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.executescript(self.SCHEMA)
+        
+        # Databases written before polar_maxima existed are summarized once
+        with self.connection:
+            if self.connection.execute("SELECT NOT EXISTS (SELECT 1 FROM polar_maxima)").fetchone()[0]:
+                self.connection.execute(
+                    "INSERT INTO polar_maxima SELECT flap_type, reynolds_number, MAX(lift_to_drag) "
+                    "FROM polars WHERE reynolds_number IS NOT NULL "
+                    "GROUP BY reynolds_number, flap_type"
+                )
+    
+    def close(self):
+        """Close the database connection"""
+        self.connection.close()
+    
+    def create_run(self, description=None, parameters=None):
+        """Register a new run and return its id"""
+        cursor = self.connection.execute(
+            "INSERT INTO runs (created, description, parameters) VALUES (?, ?, ?)",
+            (datetime.now().isoformat(), description, json.dumps(parameters or {}))
+        )
+        return cursor.lastrowid
+    
+    def insert_polars(self, run_id, flap_type, reynolds_numbers, angles, lift, drag):
+        """Bulk insert a (Reynolds number x angle) grid of lift and drag coefficients"""
+        lift = np.atleast_2d(lift)
+        drag = np.atleast_2d(drag)
+        lift_to_drag = lift / drag
+        reynolds_grid, angle_grid = np.meshgrid(reynolds_numbers, angles, indexing='ij')
+        rows = zip(
+            [run_id] * lift.size,
+            [flap_type] * lift.size,
+            reynolds_grid.ravel().tolist(),
+            angle_grid.ravel().tolist(),
+            lift.ravel().tolist(),
+            drag.ravel().tolist(),
+            lift_to_drag.ravel().tolist()
+        )
+        self.connection.executemany(
+            "INSERT INTO polars VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        
+        # Keep the per-Reynolds number maxima in step for ranked queries
+        maxima = zip(
+            [flap_type] * len(lift_to_drag),
+            np.ravel(reynolds_numbers).tolist(),
+            lift_to_drag.max(axis=1).tolist()
+        )
+        self.connection.executemany(
+            "INSERT INTO polar_maxima VALUES (?, ?, ?) "
+            "ON CONFLICT (reynolds_number, flap_type) DO UPDATE "
+            "SET max_lift_to_drag = MAX(max_lift_to_drag, excluded.max_lift_to_drag)",
+            maxima
+        )
+    
+    def ingest_results(self, results, reynolds_number, description=None, parameters=None):
+        """Store a full SimulationResults as one run in a single transaction"""
+        with self.connection:
+            run_id = self.create_run(description, parameters)
+            for flap_type in results:
+                row = results.get_row(flap_type)
+                self.insert_polars(
+                    run_id, flap_type, [reynolds_number], results.angles_of_attack,
+                    results.lift[row], results.drag[row]
+                )
+        return run_id
+    
+    def ingest_sweep(self, flap_type, reynolds_numbers, angles, lift, drag,
+                     description=None, parameters=None):
+        """Store a Reynolds number sweep as one run in a single transaction"""
+        with self.connection:
+            run_id = self.create_run(description, parameters)
+            self.insert_polars(run_id, flap_type, reynolds_numbers, angles, lift, drag)
+        return run_id
+    
+    def ingest_csv_directory(self, data_dir, reynolds_number=1e6, flap_names=None):
+        """Import legacy *_results.csv files, one run per file
+        
+        Files are matched to flap_names (FLAP_CONFIGURATIONS by default) whatever
+        their spelling; files matching no flap type are left out.
+        """
+        # Map spellings like 'double-slotted_flap' and 'double_slotted_flap' to one name
+        flap_names = FLAP_CONFIGURATIONS if flap_names is None else flap_names
+        known_names = {normalize_flap_name(name): name for name in flap_names}
+        
+        # Files in the simulator's own spelling are imported last, becoming the latest run
+        matches = []
+        for csv_path in Path(data_dir).glob("*_results.csv"):
+            stem = csv_path.stem[:-len("_results")]
+            flap_type = known_names.get(normalize_flap_name(stem))
+            if flap_type is not None:
+                current = stem == flap_type.replace(' ', '_').lower()
+                matches.append((flap_type, current, csv_path))
+        
+        run_ids = []
+        for flap_type, _, csv_path in sorted(matches):
+            df = pd.read_csv(csv_path)
+            run_ids.append(self.ingest_sweep(
+                flap_type, [reynolds_number], df['angle'].to_numpy(),
+                df['lift'].to_numpy(), df['drag'].to_numpy(),
+                description=f"Imported from {csv_path.name}"
+            ))
+        return run_ids
+    
+    def get_latest_run(self):
+        """Get the most recent run id, or None for an empty database"""
+        return self.connection.execute("SELECT MAX(run_id) FROM runs").fetchone()[0]
+    
+    def get_polars(self, run_id=None, flap_type=None):
+        """Get polar rows for a run (latest by default) as a DataFrame"""
+        run_id = run_id if run_id is not None else self.get_latest_run()
+        query = "SELECT * FROM polars WHERE run_id = ?"
+        params = [run_id]
+        if flap_type is not None:
+            query += " AND flap_type = ?"
+            params.append(flap_type)
+        return pd.read_sql_query(query + " ORDER BY rowid", self.connection, params=params)
+    
+    def get_latest_polars(self, reynolds_number):
+        """Get each flap type's most recent polar at one Reynolds number, across runs"""
+        query = """
+            SELECT polars.* FROM polars
+            JOIN (
+                SELECT flap_type, MAX(run_id) AS run_id FROM polars
+                WHERE reynolds_number = ? GROUP BY flap_type
+            ) AS latest USING (flap_type, run_id)
+            WHERE polars.reynolds_number = ?
+            ORDER BY polars.rowid
+        """
+        return pd.read_sql_query(
+            query, self.connection, params=[reynolds_number, reynolds_number]
+        )
+    
+    def top_lift_to_drag(self, n=10, reynolds_min=None, reynolds_max=None,
+                         flap_type=None):
+        """Get the n highest lift-to-drag rows across all runs within a Reynolds range"""
+        conditions = []
+        params = []
+        if reynolds_min is not None:
+            conditions.append("reynolds_number >= ?")
+            params.append(reynolds_min)
+        if reynolds_max is not None:
+            conditions.append("reynolds_number <= ?")
+            params.append(reynolds_max)
+        if flap_type is not None:
+            conditions.append("flap_type = ?")
+            params.append(flap_type)
+        
+        # The n-th best of the per-Reynolds number maxima bounds the answer from
+        # below, so only (flap, Re) groups reaching it are searched, each with an
+        # index range seek instead of scanning and sorting the whole range
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        threshold = self.connection.execute(
+            f"SELECT max_lift_to_drag FROM polar_maxima {where} "
+            "ORDER BY max_lift_to_drag DESC LIMIT 1 OFFSET ?",
+            params + [n - 1]
+        ).fetchone()
+        threshold = threshold[0] if threshold is not None else -np.inf
+        
+        # LIMIT -1 stops the candidates being flattened into the join and a CROSS
+        # JOIN fixes the order, so the planner cannot drive the join from polars
+        # with the Reynolds number range
+        where = f"WHERE {' AND '.join(conditions + ['max_lift_to_drag >= ?'])}"
+        query = f"""
+            WITH candidates AS (
+                SELECT flap_type, reynolds_number FROM polar_maxima {where} LIMIT -1
+            )
+            SELECT polars.* FROM candidates CROSS JOIN polars
+            ON polars.flap_type = candidates.flap_type
+            AND polars.reynolds_number = candidates.reynolds_number
+            AND polars.lift_to_drag >= ?
+            ORDER BY polars.lift_to_drag DESC LIMIT ?
+        """
+        return pd.read_sql_query(
+            query, self.connection, params=params + [threshold, threshold, n]
+        )
@@ -0,0 +1,132 @@
+import copy
+import numpy as np
+import pandas as pd
+from wing_model import WingModel
+
+class SensitivityAnalysis:
+    # Bases for the Halton sequence, two per parameter (A and B matrices)
+    PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
+    
+    def __init__(self, wing_model=None, angles_of_attack=None, chunk_size=100000,
+                 n_bootstrap=100, seed=0):
+        self.wing_model = wing_model if wing_model is not None else WingModel()
+        self.angles_of_attack = (np.asarray(angles_of_attack, dtype=float)
+                                 if angles_of_attack is not None
+                                 else np.arange(-5, 20, 0.5))
+        self.chunk_size = chunk_size  # rows evaluated at once, bounds memory
+        self.n_bootstrap = n_bootstrap
+        self.rng = np.random.default_rng(seed)
+        
+        # Parameter ranges (Reynolds number is sampled as log10)
+        self.parameters = {
+            'effectiveness': None,  # +/-20% around each flap's nominal value
+            'aspect_ratio': (3.0, 10.0),
+            'thickness_ratio': (0.08, 0.18),
+            'log10_reynolds_number': (5.0, 7.0),
+            'slot_drag_factor': (1.0, 1.3)
+        }
+        self.outputs = ['max_lift_to_drag', 'max_lift_coefficient']
+    
+    def get_bounds(self, flap_type):
+        """Get (lower, upper) bound arrays for a flap type's parameters"""
+        effectiveness = self.wing_model.flap_effectiveness.get(flap_type, 1.0)
+        bounds = dict(self.parameters, effectiveness=(0.8 * effectiveness, 1.2 * effectiveness))
+        lower, upper = np.array([bounds[name] for name in self.parameters]).T
+        return lower, upper
+    
+    def halton(self, start, count, dims):
+        """Generate Halton quasi-random points for sequence indices [start, start + count)"""
+        indices = np.arange(start + 1, start + count + 1)
+        points = np.empty((count, dims))
+        for d, base in enumerate(self.PRIMES[:dims]):
+            remaining = indices.copy()
+            fraction = 1.0
+            radical_inverse = np.zeros(count)
+            while remaining.any():
+                fraction /= base
+                radical_inverse += fraction * (remaining % base)
+                remaining //= base
+            points[:, d] = radical_inverse
+        return points
+    
+    def evaluate(self, flap_type, samples):
+        """Evaluate the force model for every sample row in one vectorized call"""
+        column = {name: samples[:, [i]] for i, name in enumerate(self.parameters)}
+        
+        # Parameters as (samples, 1) columns broadcast against the angle row
+        model = copy.copy(self.wing_model)
+        model.flap_effectiveness = {flap_type: column['effectiveness']}
+        model.chord_length = 1.0
+        model.wingspan = column['aspect_ratio']
+        model.thickness_ratio = column['thickness_ratio']
+        model.slot_drag_factor = column['slot_drag_factor']
+        
+        cl, cd = model.calculate_forces(
+            self.angles_of_attack[np.newaxis, :],
+            flap_type,
+            10 ** column['log10_reynolds_number']
+        )
+        return np.column_stack(((cl / cd).max(axis=1), cl.max(axis=1)))
+    
+    def sample_outputs(self, flap_type, n_samples):
+        """Evaluate the Saltelli matrices A, B and AB_i chunk by chunk"""
+        n_params = len(self.parameters)
+        lower, upper = self.get_bounds(flap_type)
+        f_a = np.empty((n_samples, len(self.outputs)))
+        f_b = np.empty_like(f_a)
+        f_ab = np.empty((n_params, n_samples, len(self.outputs)))
+        
+        for start in range(0, n_samples, self.chunk_size):
+            count = min(self.chunk_size, n_samples - start)
+            rows = slice(start, start + count)
+            points = self.halton(start, count, 2 * n_params)
+            a = lower + (upper - lower) * points[:, :n_params]
+            b = lower + (upper - lower) * points[:, n_params:]
+            f_a[rows] = self.evaluate(flap_type, a)
+            f_b[rows] = self.evaluate(flap_type, b)
+            for i in range(n_params):
+                ab = a.copy()
+                ab[:, i] = b[:, i]
+                f_ab[i, rows] = self.evaluate(flap_type, ab)
+        
+        return f_a, f_b, f_ab
+    
+    def calculate_indices(self, f_a, f_b, f_ab):
+        """Saltelli first-order and Jansen total-order indices (params x outputs)"""
+        variance = np.var(np.concatenate((f_a, f_b)), axis=0)
+        variance = np.where(variance > 0, variance, np.nan)
+        first_order = np.mean(f_b * (f_ab - f_a), axis=1) / variance
+        total = 0.5 * np.mean((f_a - f_ab)**2, axis=1) / variance
+        return first_order, total
+    
+    def analyze(self, flap_type, n_samples=10000):
+        """Compute Sobol indices with 95% bootstrap confidence intervals"""
+        f_a, f_b, f_ab = self.sample_outputs(flap_type, n_samples)
+        first_order, total = self.calculate_indices(f_a, f_b, f_ab)
+        
+        # Resample rows with replacement to estimate the spread of each index
+        bootstrap_first = []
+        bootstrap_total = []
+        for _ in range(self.n_bootstrap):
+            rows = self.rng.integers(0, n_samples, n_samples)
+            s1, st = self.calculate_indices(f_a[rows], f_b[rows], f_ab[:, rows])
+            bootstrap_first.append(s1)
+            bootstrap_total.append(st)
+        first_low, first_high = np.nanpercentile(bootstrap_first, [2.5, 97.5], axis=0)
+        total_low, total_high = np.nanpercentile(bootstrap_total, [2.5, 97.5], axis=0)
+        
+        records = []
+        for i, parameter in enumerate(self.parameters):
+            for j, output in enumerate(self.outputs):
+                records.append({
+                    'flap_type': flap_type,
+                    'output': output,
+                    'parameter': parameter,
+                    'first_order': first_order[i, j],
+                    'first_order_low': first_low[i, j],
+                    'first_order_high': first_high[i, j],
+                    'total': total[i, j],
+                    'total_low': total_low[i, j],
+                    'total_high': total_high[i, j]
+                })
+        return pd.DataFrame(records)
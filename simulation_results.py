@@ -0,0 +1,63 @@
+import numpy as np
+
+class SimulationResults:
+    def __init__(self, flap_types, angles_of_attack, dtype=np.float64):
+        self.flap_types = list(flap_types)
+        self.flap_index = {flap_type: i for i, flap_type in enumerate(self.flap_types)}
+        self.angles_of_attack = np.asarray(angles_of_attack)
+        
+        # Lift, drag and lift-to-drag planes (flap x angle) in one contiguous block
+        shape = (3, len(self.flap_types), len(self.angles_of_attack))
+        self.data = np.full(shape, np.nan, dtype=dtype)
+        self.lift = self.data[0]
+        self.drag = self.data[1]
+        
+        # Derived quantities are computed on first access and reset on updates
+        self.ratio_valid = np.zeros(len(self.flap_types), dtype=bool)
+        self.optimal_indices_cache = None
+    
+    def set_results(self, flap_type, lift, drag):
+        """Store lift and drag coefficients for a flap configuration"""
+        i = self.flap_index[flap_type]
+        self.lift[i] = lift
+        self.drag[i] = drag
+        self.ratio_valid[i] = False
+        self.optimal_indices_cache = None
+    
+    @property
+    def lift_to_drag(self):
+        """Lift-to-drag ratios, only dividing rows that changed since last access"""
+        stale = ~self.ratio_valid
+        if stale.any():
+            self.data[2, stale] = self.lift[stale] / self.drag[stale]
+            self.ratio_valid[:] = True
+        return self.data[2]
+    
+    @property
+    def optimal_indices(self):
+        """Index of the maximum lift-to-drag ratio for each flap configuration"""
+        if self.optimal_indices_cache is None:
+            self.optimal_indices_cache = np.argmax(self.lift_to_drag, axis=1)
+        return self.optimal_indices_cache
+    
+    def get_row(self, flap_type):
+        """Get the row index for a flap configuration"""
+        return self.flap_index[flap_type]
+    
+    def items(self):
+        """Iterate over (flap_type, (lift, drag)) pairs as array views"""
+        for flap_type in self.flap_types:
+            yield flap_type, self[flap_type]
+    
+    def __getitem__(self, flap_type):
+        i = self.flap_index[flap_type]
+        return self.lift[i], self.drag[i]
+    
+    def __iter__(self):
+        return iter(self.flap_types)
+    
+    def __len__(self):
+        return len(self.flap_types)
+    
+    def __contains__(self, flap_type):
+        return flap_type in self.flap_index
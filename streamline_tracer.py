@@ -0,0 +1,64 @@
+import numpy as np
+from matplotlib.path import Path as PolygonPath
+
+class StreamlineTracer:
+    def __init__(self, velocity_x, velocity_y, polygon_points=None):
+        # Velocity field on a regular grid, indexed [row (y), column (x)]
+        self.velocity_x = np.asarray(velocity_x, dtype=float)
+        self.velocity_y = np.asarray(velocity_y, dtype=float)
+        self.ny, self.nx = self.velocity_x.shape
+        
+        # Both components stacked so each corner is gathered once
+        self.field = np.stack((self.velocity_x, self.velocity_y), axis=-1)
+        
+        # Solid surface that stops trajectories, in grid coordinates
+        self.surface = PolygonPath(polygon_points) if polygon_points is not None else None
+    
+    def interpolate(self, points):
+        """Bilinearly interpolate velocity at (x, y) points given at cell centres"""
+        x = np.clip(points[:, 0] - 0.5, 0, self.nx - 1.001)
+        y = np.clip(points[:, 1] - 0.5, 0, self.ny - 1.001)
+        i = y.astype(int)
+        j = x.astype(int)
+        fy = (y - i)[:, np.newaxis]
+        fx = (x - j)[:, np.newaxis]
+        field = self.field
+        return ((1 - fy) * ((1 - fx) * field[i, j] + fx * field[i, j + 1]) +
+                fy * ((1 - fx) * field[i + 1, j] + fx * field[i + 1, j + 1]))
+    
+    def is_stopped(self, points):
+        """Check which points left the grid or hit the surface"""
+        outside = ((points[:, 0] < 0) | (points[:, 0] > self.nx) |
+                   (points[:, 1] < 0) | (points[:, 1] > self.ny))
+        if self.surface is not None:
+            outside |= self.surface.contains_points(points)
+        return outside
+    
+    def trace(self, seeds, step_size=0.5, n_steps=None):
+        """Integrate all seeds together with RK4, returning (steps + 1, seeds, 2) paths
+        
+        Positions after a trajectory stops are NaN.
+        """
+        position = np.array(seeds, dtype=float)
+        n_steps = n_steps or int(2 * self.nx / step_size)
+        paths = np.full((n_steps + 1, len(position), 2), np.nan)
+        paths[0] = position
+        active = ~self.is_stopped(position)
+        
+        for step in range(1, n_steps + 1):
+            if not active.any():
+                break
+            p = position[active]
+            k1 = self.interpolate(p)
+            k2 = self.interpolate(p + 0.5 * step_size * k1)
+            k3 = self.interpolate(p + 0.5 * step_size * k2)
+            k4 = self.interpolate(p + step_size * k3)
+            p = p + step_size / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+            
+            position[active] = p
+            stopped = self.is_stopped(p)
+            still_active = np.flatnonzero(active)[~stopped]
+            paths[step, still_active] = p[~stopped]
+            active[np.flatnonzero(active)[stopped]] = False
+        
+        return paths
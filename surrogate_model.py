@@ -0,0 +1,385 @@
+import copy
+import itertools
+import time
+import json
+from pathlib import Path
+import numpy as np
+from wing_model import WingModel
+from airfoils import FLAP_CONFIGURATIONS
+from airfoils.leading_edge_slat_flap import LeadingEdgeSlatFlap
+
+class SurrogateModel:
+    def __init__(self, bounds, degree=4, breakpoints=None, prune_tolerance=1e-7):
+        # Input names mapped to (low, high) training ranges
+        self.names = list(bounds)
+        self.lower = np.array([bounds[name][0] for name in self.names], dtype=float)
+        self.upper = np.array([bounds[name][1] for name in self.names], dtype=float)
+        self.degree = degree
+        
+        # Discontinuities split the envelope into cells, each with its own polynomial
+        breakpoints = breakpoints or {}
+        self.breakpoints = [np.asarray(breakpoints.get(name, []), dtype=float)
+                            for name in self.names]
+        self.edges = [np.concatenate(([low], breaks, [high]))
+                      for low, high, breaks in zip(self.lower, self.upper, self.breakpoints)]
+        self.cells = list(itertools.product(*[range(len(e) - 1) for e in self.edges]))
+        
+        # Total-degree truncated Legendre (polynomial chaos) basis
+        self.set_terms(np.array([
+            index for index in itertools.product(range(degree + 1), repeat=len(self.names))
+            if sum(index) <= degree
+        ]))
+        
+        # Terms whose combined coefficients stay below this are dropped after fitting
+        self.prune_tolerance = prune_tolerance
+        self.coefficients = None  # (cells, terms, 2) for lift and drag
+        self.error_bounds = None
+        self.speedup = None  # measured against the model it approximates
+        self.chunk_size = 2048  # points evaluated at once, keeps the basis in cache
+    
+    def set_terms(self, multi_indices):
+        """Set the basis terms, as sorted per-dimension polynomial orders"""
+        self.multi_indices = np.asarray(multi_indices).reshape(-1, len(self.names))
+        
+        # Terms sharing leading orders reuse the product over those dimensions:
+        # each dimension maps (parent prefix, own order) to the next set of prefixes
+        self.prefix_steps = []
+        prefixes = [()]
+        for d in range(len(self.names)):
+            extended = sorted({tuple(index[:d + 1]) for index in self.multi_indices.tolist()})
+            position = {prefix: i for i, prefix in enumerate(prefixes)}
+            self.prefix_steps.append((
+                np.array([position[prefix[:-1]] for prefix in extended], dtype=int),
+                np.array([prefix[-1] for prefix in extended], dtype=int)
+            ))
+            prefixes = extended
+    
+    def get_cell_indices(self, x):
+        """Find the flat cell index of each (N, dims) input row"""
+        cell = np.zeros(len(x), dtype=int)
+        for d, breaks in enumerate(self.breakpoints):
+            # Points on a breakpoint belong to the cell above it
+            cell = cell * (len(breaks) + 1) + np.searchsorted(breaks, x[:, d], side='right')
+        return cell
+    
+    def get_basis(self, x, cell):
+        """Evaluate the (terms, N) Legendre basis with inputs scaled to [-1, 1] within each cell"""
+        # Terms are rows so gathering polynomial orders copies contiguous memory
+        basis = np.ones((1, len(x)))
+        cell_position = np.array(self.cells)[cell]
+        for d, (edges, (parents, orders)) in enumerate(zip(self.edges, self.prefix_steps)):
+            low = edges[cell_position[:, d]]
+            high = edges[cell_position[:, d] + 1]
+            t = 2 * (x[:, d] - low) / (high - low) - 1
+            
+            # Bonnet recursion for P_0..P_degree
+            legendre = np.empty((self.degree + 1, len(x)))
+            legendre[0] = 1
+            if self.degree > 0:
+                legendre[1] = t
+            for n in range(1, self.degree):
+                legendre[n + 1] = ((2 * n + 1) * t * legendre[n] - n * legendre[n - 1]) / (n + 1)
+            basis = basis[parents] * legendre[orders]
+        return basis
+    
+    def sample(self, rng, count, cell=None):
+        """Draw uniform random inputs over the envelope or a single cell"""
+        if cell is None:
+            return self.lower + (self.upper - self.lower) * rng.random((count, len(self.names)))
+        low = np.array([edges[i] for edges, i in zip(self.edges, self.cells[cell])])
+        high = np.array([edges[i + 1] for edges, i in zip(self.edges, self.cells[cell])])
+        return low + (high - low) * rng.random((count, len(self.names)))
+    
+    def fit(self, function, n_samples=2000, n_validation=10000, seed=0):
+        """Fit each cell by least squares and record held-out error bounds
+        
+        function takes a dict of input arrays and returns (lift, drag) arrays.
+        """
+        rng = np.random.default_rng(seed)
+        samples = [self.sample(rng, n_samples, c) for c in range(len(self.cells))]
+        targets = [np.column_stack(function(dict(zip(self.names, x.T)))) for x in samples]
+        self.solve(samples, targets)
+        
+        # Legendre polynomials are bounded by 1 on [-1, 1], so dropping terms whose
+        # coefficients sum below the tolerance changes no prediction by more than it
+        magnitude = np.abs(self.coefficients).max(axis=(0, 2))
+        order = np.argsort(magnitude)
+        dropped = order[np.cumsum(magnitude[order]) <= self.prune_tolerance]
+        if len(dropped):
+            self.set_terms(np.delete(self.multi_indices, dropped, axis=0))
+            self.solve(samples, targets)
+        
+        # Validate on fresh points spread over the whole envelope, timing both models
+        x = self.sample(rng, n_validation)
+        predicted, surrogate_time = self.time_call(lambda: self.evaluate(x))
+        expected, model_time = self.time_call(
+            lambda: np.column_stack(function(dict(zip(self.names, x.T))))
+        )
+        self.speedup = model_time / surrogate_time
+        errors = np.abs(predicted - expected)
+        self.error_bounds = {
+            output: {'max': float(errors[:, i].max()),
+                     'rms': float(np.sqrt(np.mean(errors[:, i]**2)))}
+            for i, output in enumerate(['lift', 'drag'])
+        }
+        return self.error_bounds
+    
+    def time_call(self, call, repeats=3):
+        """Call repeatedly, returning the result and the fastest time in seconds"""
+        best = np.inf
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            result = call()
+            best = min(best, time.perf_counter() - start_time)
+        return result, best
+    
+    def solve(self, samples, targets):
+        """Least-squares fit of the current terms in each cell"""
+        self.coefficients = np.empty((len(self.cells), len(self.multi_indices), 2))
+        for c, (x, y) in enumerate(zip(samples, targets)):
+            basis = self.get_basis(x, np.full(len(x), c))
+            self.coefficients[c] = np.linalg.lstsq(basis.T, y, rcond=None)[0]
+    
+    def contains(self, x):
+        """Check which (N, dims) input rows lie inside the trained envelope"""
+        return np.all((x >= self.lower) & (x <= self.upper), axis=1)
+    
+    def evaluate(self, x):
+        """Predict (N, 2) lift and drag for input rows inside the envelope"""
+        predictions = np.empty((len(x), 2))
+        for start in range(0, len(x), self.chunk_size):
+            rows = slice(start, start + self.chunk_size)
+            cell = self.get_cell_indices(x[rows])
+            basis = self.get_basis(x[rows], cell)
+            if len(self.cells) == 1:
+                predictions[rows] = basis.T @ self.coefficients[0]
+            else:
+                predictions[rows] = np.einsum('tn,nto->no', basis, self.coefficients[cell])
+        return predictions
+    
+    def save(self, path, **metadata):
+        """Save coefficients and envelope to an .npz file"""
+        metadata.update({
+            'bounds': {name: [low, high] for name, low, high in
+                       zip(self.names, self.lower.tolist(), self.upper.tolist())},
+            'breakpoints': {name: breaks.tolist() for name, breaks in
+                            zip(self.names, self.breakpoints)},
+            'degree': self.degree,
+            'terms': self.multi_indices.tolist(),
+            'error_bounds': self.error_bounds,
+            'speedup': self.speedup
+        })
+        np.savez(path, coefficients=self.coefficients, metadata=json.dumps(metadata))
+    
+    @classmethod
+    def load(cls, path):
+        """Load a saved surrogate, returning it and its extra metadata"""
+        with np.load(path) as data:
+            metadata = json.loads(str(data['metadata']))
+            coefficients = data['coefficients']
+        model = cls(metadata.pop('bounds'), metadata.pop('degree'), metadata.pop('breakpoints'))
+        model.set_terms(metadata.pop('terms'))
+        model.coefficients = coefficients
+        model.error_bounds = metadata.pop('error_bounds')
+        model.speedup = metadata.pop('speedup')
+        return model, metadata
+
+class ForceSurrogate:
+    # Discontinuities in the per-flap force models; points on a breakpoint use
+    # the cell above it, so 14 degrees is nudged up to stay with |angle| <= 14
+    FLAP_BREAKPOINTS = {
+        'LeadingEdgeSlatFlap': {
+            'angle_of_attack': [-14.0, np.nextafter(14.0, np.inf)],
+            'log10_reynolds_number': [6.0]
+        }
+    }
+    
+    # Flap classes that load may rebuild, by class name; saved files never
+    # choose what gets imported
+    FLAP_CLASSES = {
+        flap_class.__name__: flap_class
+        for flap_class in [*FLAP_CONFIGURATIONS.values(), LeadingEdgeSlatFlap]
+    }
+    
+    def __init__(self, wing_model=None, degree=5, max_error=1e-4):
+        self.wing_model = wing_model if wing_model is not None else WingModel()
+        self.degree = degree
+        self.max_error = max_error  # validated bound needed before a surrogate is used
+        
+        # Envelope for the wing model (effectiveness is the deflection input,
+        # set per flap to +/-20% around its nominal value)
+        self.bounds = {
+            'angle_of_attack': (-10.0, 25.0),
+            'log10_reynolds_number': (5.0, 7.0),
+            'effectiveness': None,
+            'inverse_aspect_ratio': (1 / 12, 1 / 3),
+            'thickness_ratio': (0.08, 0.18)
+        }
+        self.models = {}       # flap type -> surrogate of WingModel.calculate_forces
+        self.flap_models = {}  # flap type -> surrogate of the flap's own calculate_forces
+        
+        # Wing model settings the surrogates were trained with
+        self.fixed_parameters = None
+    
+    def get_fixed_parameters(self):
+        """Model settings the wing surrogates are trained for but do not take as inputs"""
+        return {
+            'slot_drag_factor': self.wing_model.slot_drag_factor,
+            'friction_model': self.wing_model.friction_model
+        }
+    
+    def get_bounds(self, effectiveness):
+        """Get the wing model envelope around a nominal flap effectiveness"""
+        return dict(self.bounds, effectiveness=(0.8 * effectiveness, 1.2 * effectiveness))
+    
+    def evaluate_wing_model(self, flap_type, inputs):
+        """Evaluate the full wing model for a batch of surrogate inputs"""
+        model = copy.copy(self.wing_model)
+        model.flap_effectiveness = {flap_type: inputs['effectiveness']}
+        model.chord_length = 1.0
+        model.wingspan = 1 / inputs['inverse_aspect_ratio']
+        model.thickness_ratio = inputs['thickness_ratio']
+        return model.calculate_forces(
+            inputs['angle_of_attack'], flap_type, 10 ** inputs['log10_reynolds_number']
+        )
+    
+    def evaluate_flap(self, flap, inputs):
+        """Evaluate a flap's scalar calculate_forces for a batch of surrogate inputs"""
+        flap = copy.copy(flap)
+        forces = []
+        for angle, log_reynolds, effectiveness in zip(
+            inputs['angle_of_attack'], inputs['log10_reynolds_number'], inputs['effectiveness']
+        ):
+            flap.effectiveness = effectiveness
+            forces.append(flap.calculate_forces(angle, 10 ** log_reynolds))
+        return np.array(forces, dtype=float).T
+    
+    def train(self, flap_types, n_samples=2000, n_validation=10000, seed=0):
+        """Train wing model surrogates for every flap type, plus per-flap force methods"""
+        self.fixed_parameters = self.get_fixed_parameters()
+        for i, (flap_type, flap) in enumerate(flap_types.items()):
+            effectiveness = self.wing_model.flap_effectiveness.get(flap_type, 1.0)
+            model = SurrogateModel(self.get_bounds(effectiveness), self.degree)
+            model.fit(lambda inputs: self.evaluate_wing_model(flap_type, inputs),
+                      n_samples, n_validation, seed + i)
+            self.models[flap_type] = model
+            
+            if hasattr(flap, 'calculate_forces'):
+                self.train_flap(flap_type, flap, n_samples, n_validation, seed + i)
+        
+        return {flap_type: model.error_bounds for flap_type, model in self.models.items()}
+    
+    def train_flap(self, flap_type, flap, n_samples=2000, n_validation=10000, seed=0):
+        """Train a surrogate of a flap object's own calculate_forces method"""
+        bounds = {
+            'angle_of_attack': self.bounds['angle_of_attack'],
+            'log10_reynolds_number': self.bounds['log10_reynolds_number'],
+            'effectiveness': (0.8 * flap.effectiveness, 1.2 * flap.effectiveness)
+        }
+        model = SurrogateModel(bounds, self.degree, self.FLAP_BREAKPOINTS.get(type(flap).__name__))
+        model.fit(lambda inputs: self.evaluate_flap(flap, inputs), n_samples, n_validation, seed)
+        self.flap_models[flap_type] = (model, flap)
+        return model.error_bounds
+    
+    def is_usable(self, model):
+        """Check whether a surrogate is within max_error and faster than its model"""
+        trusted = all(bound['max'] <= self.max_error for bound in model.error_bounds.values())
+        return trusted and model.speedup > 1
+    
+    def get_wing_model(self, flap_type, effectiveness=None, aspect_ratio=None,
+                       thickness_ratio=None):
+        """Get the wing model, copied with any per-call overrides applied"""
+        if effectiveness is None and aspect_ratio is None and thickness_ratio is None:
+            return self.wing_model
+        model = copy.copy(self.wing_model)
+        if effectiveness is not None:
+            model.flap_effectiveness = dict(model.flap_effectiveness, **{flap_type: effectiveness})
+        if aspect_ratio is not None:
+            model.wingspan = np.asarray(aspect_ratio) * model.chord_length
+        if thickness_ratio is not None:
+            model.thickness_ratio = thickness_ratio
+        return model
+    
+    def predict(self, model, x, fallback):
+        """Predict with the surrogate inside its envelope and the full model elsewhere"""
+        inside = model.contains(x) if self.is_usable(model) else np.zeros(len(x), dtype=bool)
+        predictions = np.empty((len(x), 2))
+        predictions[inside] = model.evaluate(x[inside])
+        if not inside.all():
+            outside = ~inside
+            predictions[outside] = np.column_stack(
+                fallback(dict(zip(model.names, x[outside].T)))
+            )
+        return predictions[:, 0], predictions[:, 1]
+    
+    def calculate_forces(self, angle_of_attack, flap_type, reynolds_number,
+                         effectiveness=None, aspect_ratio=None, thickness_ratio=None):
+        """Batched lift and drag coefficients matching WingModel.calculate_forces
+        
+        Geometry defaults to the wing model's current values; all inputs broadcast
+        together. The vectorized wing model is called directly unless the trained
+        surrogate measured faster than it.
+        """
+        wing = self.wing_model
+        model = self.models.get(flap_type)
+        if (model is None or not self.is_usable(model) or
+                self.fixed_parameters != self.get_fixed_parameters()):
+            wing = self.get_wing_model(flap_type, effectiveness, aspect_ratio, thickness_ratio)
+            cl, cd = np.broadcast_arrays(*wing.calculate_forces(
+                angle_of_attack, flap_type, reynolds_number
+            ))
+            return cl, cd
+        
+        columns = np.broadcast_arrays(
+            np.asarray(angle_of_attack, dtype=float),
+            np.log10(reynolds_number),
+            wing.flap_effectiveness.get(flap_type, 1.0) if effectiveness is None else effectiveness,
+            1 / (wing.get_aspect_ratio() if aspect_ratio is None else np.asarray(aspect_ratio)),
+            wing.thickness_ratio if thickness_ratio is None else thickness_ratio
+        )
+        x = np.column_stack([np.ravel(column) for column in columns])
+        cl, cd = self.predict(model, x, lambda inputs: self.evaluate_wing_model(flap_type, inputs))
+        return cl.reshape(columns[0].shape), cd.reshape(columns[0].shape)
+    
+    def calculate_flap_forces(self, flap_type, angle_of_attack, reynolds_number):
+        """Batched lift and drag from a flap's own calculate_forces method"""
+        model, flap = self.flap_models[flap_type]
+        columns = np.broadcast_arrays(
+            np.asarray(angle_of_attack, dtype=float),
+            np.log10(reynolds_number),
+            flap.effectiveness
+        )
+        x = np.column_stack([np.ravel(column) for column in columns])
+        cl, cd = self.predict(model, x, lambda inputs: self.evaluate_flap(flap, inputs))
+        return cl.reshape(columns[0].shape), cd.reshape(columns[0].shape)
+    
+    def save(self, directory):
+        """Save every trained surrogate as an .npz file in a directory"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for flap_type, model in self.models.items():
+            slug = flap_type.lower().replace(' ', '_')
+            model.save(directory / f"{slug}_wing.npz", flap_type=flap_type,
+                       source='wing', fixed_parameters=self.fixed_parameters)
+        for flap_type, (model, flap) in self.flap_models.items():
+            slug = flap_type.lower().replace(' ', '_')
+            model.save(directory / f"{slug}_flap.npz", flap_type=flap_type, source='flap',
+                       flap_class=type(flap).__name__, effectiveness=float(flap.effectiveness))
+    
+    def load(self, directory):
+        """Load surrogates saved by save, rebuilding flap objects for their fallbacks"""
+        for path in sorted(Path(directory).glob("*.npz")):
+            model, metadata = SurrogateModel.load(path)
+            flap_type = metadata['flap_type']
+            if metadata['source'] == 'wing':
+                self.models[flap_type] = model
+                self.fixed_parameters = metadata['fixed_parameters']
+            else:
+                # Older files store a module path; only the class name is looked up
+                class_name = metadata['flap_class'].rsplit('.', 1)[-1]
+                if class_name not in self.FLAP_CLASSES:
+                    raise ValueError(f"Unknown flap class in {path.name}: {class_name}")
+                flap = self.FLAP_CLASSES[class_name]()
+                flap.effectiveness = metadata['effectiveness']
+                self.flap_models[flap_type] = (model, flap)
+        return self
@@ -0,0 +1,137 @@
+import numpy as np
+import copy
+import json
+import os
+import time
+from pathlib import Path
+
+class SweepCampaign:
+    def __init__(self, wing_model, angles_of_attack, output_dir,
+                 flap_types, reynolds_numbers, geometries=None, chunk_size=100):
+        self.wing_model = wing_model
+        self.angles_of_attack = np.asarray(angles_of_attack, dtype=float)
+        self.flap_types = list(flap_types)
+        self.reynolds_numbers = np.asarray(reynolds_numbers, dtype=float)
+        self.geometries = geometries if geometries is not None else [{}]  # WingModel attribute overrides
+        self.chunk_size = chunk_size
+        
+        # Chunk files and the manifest of completed chunks
+        self.output_dir = Path(output_dir)
+        self.chunks_dir = self.output_dir / "chunks"
+        self.manifest_path = self.output_dir / "manifest.json"
+        self.chunks_dir.mkdir(parents=True, exist_ok=True)
+    
+    def get_config(self):
+        """Get the campaign definition stored in the manifest"""
+        # Overrides may hold numpy scalars or arrays; store them as plain JSON types
+        geometries = json.loads(json.dumps(self.geometries, default=lambda value: value.tolist()))
+        return {
+            'flap_types': self.flap_types,
+            'reynolds_numbers': self.reynolds_numbers.tolist(),
+            'geometries': geometries,
+            'angles': self.angles_of_attack.tolist(),
+            'chunk_size': self.chunk_size
+        }
+    
+    def get_chunks(self):
+        """List (chunk_id, flap_type, geometry_index, reynolds slice) for the whole campaign"""
+        chunks = []
+        for geometry_index in range(len(self.geometries)):
+            for flap_type in self.flap_types:
+                slug = flap_type.replace(' ', '_').lower()
+                for start in range(0, len(self.reynolds_numbers), self.chunk_size):
+                    stop = min(start + self.chunk_size, len(self.reynolds_numbers))
+                    chunk_id = f"{slug}_g{geometry_index}_re{start}-{stop}"
+                    chunks.append((chunk_id, flap_type, geometry_index, slice(start, stop)))
+        return chunks
+    
+    def load_manifest(self):
+        """Load completed chunk ids, checking the campaign definition is unchanged"""
+        if not self.manifest_path.exists():
+            return []
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+        if manifest['config'] != self.get_config():
+            raise ValueError(
+                f"Campaign in {self.output_dir} was started with different settings"
+            )
+        return manifest['completed']
+    
+    def save_manifest(self, completed):
+        """Atomically replace the manifest of completed chunks"""
+        self.write_atomic(self.manifest_path, lambda f: f.write(json.dumps({
+            'config': self.get_config(),
+            'completed': completed
+        }, indent=2).encode()))
+    
+    def write_atomic(self, path, write):
+        """Write a file via a temporary file so readers never see a partial write"""
+        temp_path = path.with_name(path.name + '.tmp')
+        with open(temp_path, 'wb') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    
+    def get_wing_model(self, geometry_index):
+        """Get a wing model with a geometry's parameter overrides applied"""
+        wing_model = copy.copy(self.wing_model)
+        for name, value in self.geometries[geometry_index].items():
+            setattr(wing_model, name, value)
+        return wing_model
+    
+    def run(self, verbose=True):
+        """Run all chunks not yet completed, committing each one as it finishes"""
+        completed = self.load_manifest()
+        done = set(completed)
+        chunks = self.get_chunks()
+        remaining = [chunk for chunk in chunks if chunk[0] not in done]
+        
+        if verbose and done:
+            print(f"Resuming campaign: {len(done)}/{len(chunks)} chunks already complete")
+        
+        start_time = time.perf_counter()
+        for count, (chunk_id, flap_type, geometry_index, reynolds_slice) in enumerate(remaining, 1):
+            reynolds_numbers = self.reynolds_numbers[reynolds_slice]
+            lift, drag = self.get_wing_model(geometry_index).calculate_polars(
+                self.angles_of_attack, flap_type, reynolds_numbers
+            )
+            
+            # Commit the chunk data before recording it as complete
+            self.write_atomic(self.chunks_dir / f"{chunk_id}.npz", lambda f: np.savez(
+                f, reynolds_numbers=reynolds_numbers, lift=lift, drag=drag
+            ))
+            completed.append(chunk_id)
+            self.save_manifest(completed)
+            
+            if verbose:
+                # Estimate time remaining from measured throughput
+                elapsed = time.perf_counter() - start_time
+                rate = count / elapsed
+                eta = (len(remaining) - count) / rate
+                print(f"[{len(completed)}/{len(chunks)}] {chunk_id} "
+                      f"({rate:.1f} chunks/s, ETA {eta:.1f}s)")
+        
+        return self.load_results()
+    
+    def load_results(self):
+        """Load completed chunks as {(flap_type, geometry_index): (reynolds, lift, drag)}"""
+        done = set(self.load_manifest())
+        parts = {}
+        for chunk_id, flap_type, geometry_index, _ in self.get_chunks():
+            if chunk_id not in done:
+                continue
+            with np.load(self.chunks_dir / f"{chunk_id}.npz") as chunk:
+                parts.setdefault((flap_type, geometry_index), []).append(
+                    (chunk['reynolds_numbers'], chunk['lift'], chunk['drag'])
+                )
+        
+        results = {}
+        for key, chunk_list in parts.items():
+            reynolds_numbers, lift, drag = zip(*chunk_list)
+            results[key] = (
+                np.concatenate(reynolds_numbers),
+                np.concatenate(lift),
+                np.concatenate(drag)
+            )
+        return results
@@ -0,0 +1,95 @@
+import numpy as np
+from wing_model import WingModel
+
+class RingBuffer:
+    def __init__(self, capacity, width, dtype=np.float64):
+        self.capacity = capacity
+        self.data = np.zeros((capacity, width), dtype=dtype)
+        self.index = 0
+        self.count = 0
+    
+    def append(self, values):
+        """Store one row, overwriting the oldest once full"""
+        self.data[self.index] = values
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+    
+    def get(self):
+        """Get stored rows in chronological order"""
+        if self.count < self.capacity:
+            return self.data[:self.count]
+        return np.roll(self.data, -self.index, axis=0)
+
+class UnsteadyWingModel:
+    def __init__(self, wing_model=None):
+        self.wing_model = wing_model if wing_model is not None else WingModel()
+        
+        # Jones' two-term approximation of the Wagner function
+        self.wagner_coefficients = np.array([0.165, 0.335])
+        self.wagner_exponents = np.array([0.0455, 0.3])
+    
+    def create_ramp_schedules(self, deploy_times, duration, dt):
+        """Create linear 0 -> 1 deployment schedules, one per deployment time"""
+        time = np.arange(0, duration, dt)
+        deploy_times = np.asarray(deploy_times, dtype=float)[:, np.newaxis]
+        return np.clip(time[np.newaxis, :] / deploy_times, 0, 1)
+    
+    def calculate_quasi_steady(self, deployment, flap_type, angle_of_attack, reynolds_number):
+        """Calculate steady lift and drag for partially deployed flaps"""
+        effectiveness = self.wing_model.flap_effectiveness.get(flap_type, 1.0)
+        
+        # Blend from the clean wing (effectiveness 1) to the fully deployed flap
+        partial_effectiveness = 1 + deployment * (effectiveness - 1)
+        cl = self.wing_model.calculate_lift(angle_of_attack, flap_type, partial_effectiveness)
+        
+        slot_factor = 1 + deployment * (self.wing_model.get_slot_drag_factor(flap_type) - 1)
+        cd_parasitic = self.wing_model.calculate_parasitic_drag(reynolds_number) * slot_factor
+        return cl, cd_parasitic, partial_effectiveness
+    
+    def integrate(self, deployment, flap_type, angle_of_attack, airspeed, dt,
+                  reynolds_number=1e6, history_length=None):
+        """Integrate lift and drag over deployment schedules with Wagner lift lag
+        
+        deployment is a (schedules, steps) array of deployment fractions from 0 to 1.
+        angle_of_attack, airspeed (m/s) and reynolds_number may be scalars or per-schedule.
+        Returns (lift, drag) arrays of shape (schedules, steps), matching deployment,
+        or only the last history_length steps when given.
+        """
+        deployment = np.atleast_2d(np.asarray(deployment, dtype=float))
+        n_schedules, n_steps = deployment.shape
+        history_length = history_length or n_steps
+        
+        cl_steady, cd_parasitic, effectiveness = self.calculate_quasi_steady(
+            deployment.T,
+            flap_type,
+            np.asarray(angle_of_attack, dtype=float),
+            np.asarray(reynolds_number, dtype=float)
+        )
+        cl_steady = np.broadcast_to(cl_steady, (n_steps, n_schedules))
+        cd_parasitic = np.broadcast_to(cd_parasitic, (n_steps, n_schedules))
+        effectiveness = np.broadcast_to(effectiveness, (n_steps, n_schedules))
+        
+        # Decay of each lag state over one step of semichords travelled
+        ds = 2 * np.asarray(airspeed, dtype=float) * dt / self.wing_model.chord_length
+        exponents = self.wagner_exponents[:, np.newaxis] * ds
+        decay = np.exp(-exponents)
+        gain = self.wagner_coefficients[:, np.newaxis] * np.exp(-exponents / 2)
+        
+        lift_history = RingBuffer(history_length, n_schedules)
+        drag_history = RingBuffer(history_length, n_schedules)
+        lag_states = np.zeros((2, n_schedules))
+        
+        # Schedules start from steady flow at their initial deployment
+        for step in range(n_steps):
+            if step > 0:
+                delta_cl = cl_steady[step] - cl_steady[step - 1]
+                lag_states = lag_states * decay + gain * delta_cl
+            cl = cl_steady[step] - lag_states.sum(axis=0)
+            cd = cd_parasitic[step] + self.wing_model.calculate_induced_drag(
+                cl, flap_type, effectiveness[step]
+            )
+            
+            lift_history.append(cl)
+            drag_history.append(cd)
+        
+        return lift_history.get().T, drag_history.get().T
@@ -3,12 +3,16 @@ import numpy as np
 from pathlib import Path
 import pygame.gfxdraw
 import colorsys
+import copy
+import threading
+import time
+from lattice_boltzmann import LatticeBoltzmannSolver
 
 class AerodynamicVisualizer:
-    def __init__(self):
+    def __init__(self, width=1200, height=800):
         pygame.init()
-        self.width = 1200
-        self.height = 800
+        self.width = width
+        self.height = height
         self.screen = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption("Airfoil and Flap Configuration Visualization")
         
@@ -27,12 +31,41 @@ class AerodynamicVisualizer:
         # UI elements
         self.button_height = 40
         self.button_width = 150
+        self.button_font = pygame.font.Font(None, 24)
+        self.speed_font = pygame.font.Font(None, 36)
+        
+        # Cached UI layer, redrawn only when hover state or airspeed changes
+        self.background = pygame.Surface((self.width, self.height))
+        self.ui_dirty = True
+        self.hovered_button = None
+        self.dirty_rects = []
         
         # Simulation state
         self.current_flap = None
         self.angle = 0
         self.flap_angle = 0
         self.time = 0
+        self.max_flap_angle = np.radians(20)
+        
+        # Precomputed force trajectory (deployment, lift, drag per frame)
+        self.trajectory = None
+        
+        # Optional lattice-Boltzmann flow field driving the particles
+        self.flow_solver = None
+        self.flow_scale = 4  # pixels per lattice cell
+        self.flow_steps_per_frame = 10
+        
+        # Fixed-timestep simulation, decoupled from the render rate
+        self.timestep = 1/60  # simulated seconds per step
+        self.max_step_pixels = 4  # largest particle move per sub-step
+        self.step_budget = 1/60  # wall-clock seconds of catch-up stepping per frame
+        self.simulation_lock = threading.Lock()
+        self.simulation_thread = None
+        self.simulation_running = False
+        
+        # Drawable state, double-buffered: [front (rendered), back (being written)]
+        self.render_buffers = [None, None]
+        self.buffer_lock = threading.Lock()
         
         # Initialize other attributes
         self.clock = pygame.time.Clock()
@@ -59,6 +92,7 @@ class AerodynamicVisualizer:
                 self.speed_button_width, self.speed_button_height
             )
         }
+        self.speed_panel = pygame.Rect(0, self.height - 50, 300, 50)
 
     def create_particles(self):
         """Create particles for airflow visualization"""
@@ -71,23 +105,64 @@ class AerodynamicVisualizer:
             for j in range(cols):
                 particles.append({
                     'pos': np.array([j * spacing - spacing, i * spacing + 100], dtype=float),
+                    'start_y': i * spacing + 100,  # Row to respawn in
                     'velocity': np.array([self.AIRSPEED_PIXELS, 0], dtype=float),
                     'temperature': float(self.TEMPERATURE_RANGE[0]),
                     'pressure': 1.0
                 })
         return particles
 
-    def update_particles(self, wing_points):
-        """Update particle positions and properties"""
+    def enable_flow_solver(self, enabled=True):
+        """Switch particles between the lattice-Boltzmann field and the simple deflection model"""
+        if enabled:
+            self.flow_solver = LatticeBoltzmannSolver(
+                self.width // self.flow_scale, self.height // self.flow_scale
+            )
+        else:
+            self.flow_solver = None
+        self.particles = self.create_particles()
+    
+    def is_off_screen(self, position):
+        """Check whether a particle has left through the right, top or bottom edge"""
+        return position[0] > self.width or not 0 <= position[1] <= self.height
+    
+    def advect_particles(self, fraction=1.0):
+        """Update particles from the lattice-Boltzmann velocity and pressure fields"""
+        positions = np.array([particle['pos'] for particle in self.particles])
+        velocity, pressure_coefficient = self.flow_solver.sample(positions / self.flow_scale)
+        velocity *= self.AIRSPEED_PIXELS
+        
+        # Low pressure shows cold, high pressure shows hot
+        cp = np.clip(pressure_coefficient, -1, 1)
+        temperature = self.TEMPERATURE_RANGE[0] + (cp + 1) / 2 * (
+            self.TEMPERATURE_RANGE[1] - self.TEMPERATURE_RANGE[0]
+        )
+        
+        for i, particle in enumerate(self.particles):
+            particle['velocity'] = velocity[i]
+            particle['pos'] += particle['velocity'] * fraction
+            particle['temperature'] = temperature[i]
+            particle['pressure'] = 1 + 0.2 * cp[i]
+            
+            # Reset particles that move off screen
+            if self.is_off_screen(particle['pos']):
+                particle['pos'][:] = (-40, particle['start_y'])
+    
+    def update_particles(self, wing_points, fraction=1.0):
+        """Update particle positions and properties over a fraction of a frame"""
+        if self.flow_solver is not None:
+            self.advect_particles(fraction)
+            return
+        
         wing_center = np.mean(wing_points, axis=0)
         
         for particle in self.particles:
             # Update position based on velocity
-            particle['pos'] += particle['velocity']
+            particle['pos'] += particle['velocity'] * fraction
             
             # Reset particles that move off screen
-            if particle['pos'][0] > self.width:
-                particle['pos'][0] = -40
+            if self.is_off_screen(particle['pos']):
+                particle['pos'][:] = (-40, particle['start_y'])
                 particle['temperature'] = self.TEMPERATURE_RANGE[0]
                 particle['pressure'] = 1.0
                 particle['velocity'] = np.array([self.AIRSPEED_PIXELS, 0], dtype=float)
@@ -134,23 +209,23 @@ class AerodynamicVisualizer:
         rgb = colorsys.hsv_to_rgb(hue, saturation, value)
         return tuple(int(max(min(x * 255, 255), 0)) for x in rgb)
 
-    def draw_airflow(self, wing_points):
-        """Draw airflow patterns with thermal indicators"""
-        self.update_particles(wing_points)
+    def draw_airflow(self, state):
+        """Draw airflow patterns with thermal indicators from a published particle state"""
+        rects = []
         
-        for particle in self.particles:
-            # Calculate end point based on velocity
-            end_point = particle['pos'] + particle['velocity'] * 4
-            
+        # Calculate end points based on velocity
+        end_points = state['positions'] + state['velocities'] * 4
+        
+        for start_pos, end_pos, temperature, pressure in zip(
+            state['positions'], end_points, state['temperatures'], state['pressures']
+        ):
             # Get color based on temperature and pressure
-            color = self.get_particle_color(particle['temperature'], particle['pressure'])
-            
-            # Convert numpy arrays to tuples for pygame
-            start_pos = tuple(int(x) for x in particle['pos'])
-            end_pos = tuple(int(x) for x in end_point)
+            color = self.get_particle_color(temperature, pressure)
             
             # Draw arrow
-            self.draw_arrow(self.screen, start_pos, end_pos, color)
+            rects.append(self.draw_arrow(self.screen, start_pos, end_pos, color))
+        
+        return rects
 
     def create_buttons(self, flap_types):
         """Create buttons for flap type selection"""
@@ -172,7 +247,7 @@ class AerodynamicVisualizer:
         start = tuple(int(x) for x in start)
         end = tuple(int(x) for x in end)
         
-        pygame.draw.line(surface, color, start, end, width)
+        line_rect = pygame.draw.line(surface, color, start, end, width)
         angle = np.arctan2(end[1] - start[1], end[0] - start[0])
         arrow_size = 10
         
@@ -183,7 +258,8 @@ class AerodynamicVisualizer:
             (int(end[0] - arrow_size * np.cos(angle + np.pi/6)),
              int(end[1] - arrow_size * np.sin(angle + np.pi/6)))
         ]
-        pygame.draw.polygon(surface, color, arrow_points)
+        arrow_rect = pygame.draw.polygon(surface, color, arrow_points)
+        return line_rect.union(arrow_rect)
 
     def calculate_deflection(self, point, wing_points):
         """Calculate airflow deflection based on wing geometry"""
@@ -200,73 +276,291 @@ class AerodynamicVisualizer:
         
         # Update pixel speed (scale appropriately)
         self.AIRSPEED_PIXELS = self.AIRSPEED / 36  # Scale factor for visualization
+        self.ui_dirty = True
 
-    def draw_speed_controls(self):
+    def draw_speed_controls(self, surface):
         """Draw speed control buttons and display"""
         # Draw speed display
-        font = pygame.font.Font(None, 36)
-        speed_text = font.render(f"Airspeed: {self.AIRSPEED} kts", True, self.TEXT_COLOR)
-        self.screen.blit(speed_text, (10, self.height - 40))
+        speed_text = self.speed_font.render(f"Airspeed: {self.AIRSPEED} kts", True, self.TEXT_COLOR)
+        surface.blit(speed_text, (10, self.height - 40))
         
         # Draw decrease button (-)
-        pygame.draw.rect(self.screen, self.BUTTON_COLOR, self.speed_buttons['decrease'], border_radius=5)
+        pygame.draw.rect(surface, self.BUTTON_COLOR, self.speed_buttons['decrease'], border_radius=5)
         pygame.draw.line(
-            self.screen, self.TEXT_COLOR,
+            surface, self.TEXT_COLOR,
             (self.speed_buttons['decrease'].left + 8, self.speed_buttons['decrease'].centery),
             (self.speed_buttons['decrease'].right - 8, self.speed_buttons['decrease'].centery),
             3
         )
         
         # Draw increase button (+)
-        pygame.draw.rect(self.screen, self.BUTTON_COLOR, self.speed_buttons['increase'], border_radius=5)
+        pygame.draw.rect(surface, self.BUTTON_COLOR, self.speed_buttons['increase'], border_radius=5)
         # Horizontal line
         pygame.draw.line(
-            self.screen, self.TEXT_COLOR,
+            surface, self.TEXT_COLOR,
             (self.speed_buttons['increase'].left + 8, self.speed_buttons['increase'].centery),
             (self.speed_buttons['increase'].right - 8, self.speed_buttons['increase'].centery),
             3
         )
         # Vertical line
         pygame.draw.line(
-            self.screen, self.TEXT_COLOR,
+            surface, self.TEXT_COLOR,
             (self.speed_buttons['increase'].centerx, self.speed_buttons['increase'].top + 8),
             (self.speed_buttons['increase'].centerx, self.speed_buttons['increase'].bottom - 8),
             3
         )
 
-    def run_visualization(self, flap_types):
-        """Run the interactive visualization"""
+    def load_trajectory(self, deployment, lift, drag, dt=1/60):
+        """Play back a precomputed deployment schedule and its force history
+        
+        dt is the schedule's timestep in seconds, e.g. the one passed to
+        UnsteadyWingModel.integrate, so playback runs in real time. Single
+        schedules from integrate, shaped (1, steps), are accepted as well.
+        """
+        deployment = np.squeeze(deployment)
+        lift = np.squeeze(lift)
+        drag = np.squeeze(drag)
+        for name, values in [('deployment', deployment), ('lift', lift), ('drag', drag)]:
+            if values.ndim != 1:
+                raise ValueError(f"Trajectory {name} must be a single schedule, got shape {values.shape}")
+        if not len(deployment) == len(lift) == len(drag):
+            raise ValueError(
+                f"Trajectory lengths differ: deployment {len(deployment)}, "
+                f"lift {len(lift)}, drag {len(drag)}"
+            )
+        
+        self.trajectory = {
+            'flap_angle': deployment * self.max_flap_angle,
+            'lift': lift,
+            'drag': drag,
+            'dt': dt
+        }
+    
+    def draw_force_readout(self, frame):
+        """Draw lift and drag coefficients for the current trajectory frame"""
+        text = self.speed_font.render(
+            f"CL: {self.trajectory['lift'][frame]:.3f}  CD: {self.trajectory['drag'][frame]:.4f}",
+            True, self.TEXT_COLOR
+        )
+        return self.screen.blit(text, (self.width - text.get_width() - 10, self.height - 40))
+    
+    def create_ui_layer(self, flap_types):
+        """Create the buttons and pre-render their labels"""
         self.buttons = self.create_buttons(flap_types)
-        self.current_flap = list(flap_types.values())[0]
+        self.button_labels = {
+            flap_type: self.button_font.render(flap_type, True, self.TEXT_COLOR)
+            for flap_type in flap_types
+        }
         
-        while self.running:
-            self.handle_events(flap_types)
-            self.screen.fill(self.BACKGROUND)
-            
-            # Draw UI elements
-            self.draw_buttons()
-            self.draw_speed_controls()  # Add speed controls
+        # Screen areas covered by the UI layer
+        button_area = pygame.Rect(next(iter(self.buttons.values()))).unionall(
+            list(self.buttons.values())
+        )
+        self.ui_rects = [button_area, self.speed_panel]
+        self.ui_dirty = True
+    
+    def update_ui_layer(self):
+        """Redraw the cached UI layer if invalidated, returning the screen areas it covers"""
+        mouse_pos = pygame.mouse.get_pos()
+        hovered = next(
+            (flap_type for flap_type, button in self.buttons.items()
+             if button.collidepoint(mouse_pos)),
+            None
+        )
+        if hovered != self.hovered_button:
+            self.hovered_button = hovered
+            self.ui_dirty = True
+        
+        if not self.ui_dirty:
+            return []
+        
+        self.background.fill(self.BACKGROUND)
+        self.draw_buttons(self.background)
+        self.draw_speed_controls(self.background)
+        self.ui_dirty = False
+        
+        for rect in self.ui_rects:
+            self.screen.blit(self.background, rect, rect)
+        return self.ui_rects
+    
+    def update_scene(self, substeps=1):
+        """Advance flap geometry and particles by one frame without drawing"""
+        # Update flap angle
+        if self.trajectory is not None:
+            frame = int(round(self.time / self.trajectory['dt']))
+            self.trajectory_frame = frame % len(self.trajectory['flap_angle'])
+            self.flap_angle = self.trajectory['flap_angle'][self.trajectory_frame]
+        else:
+            self.flap_angle = self.max_flap_angle * np.sin(np.radians(self.angle))
+        
+        # Get wing geometry and move particles around it
+        self.wing_points = self.current_flap.get_flap_geometry(
+            self.width//2, self.height//2, self.flap_angle
+        )
+        if self.flow_solver is not None:
+            self.flow_solver.set_obstacle(self.wing_points, self.flow_scale)
             
-            # Update flap angle
-            self.flap_angle = np.radians(20 * np.sin(np.radians(self.angle)))
+            # The lattice advances a fixed number of steps per frame, however
+            # many sub-steps the particles take
+            self.flow_solver.step(self.flow_steps_per_frame)
+        
+        # Sub-steps keep fast particles from jumping across the wing
+        for _ in range(substeps):
+            self.update_particles(self.wing_points, 1 / substeps)
+    
+    def advance_animation(self):
+        """Advance the animation clock by one fixed timestep"""
+        self.angle = (self.angle + 1) % 360
+        self.time += self.timestep
+    
+    def get_substeps(self):
+        """Number of sub-steps needed to keep particle moves below max_step_pixels"""
+        return max(1, int(np.ceil(self.AIRSPEED_PIXELS / self.max_step_pixels)))
+    
+    def get_simulation_state(self):
+        """Copy the state that later frames depend on, e.g. to resume elsewhere"""
+        return {
+            'particles': copy.deepcopy(self.particles),
+            'angle': self.angle,
+            'time': self.time,
+            'flow_solver': copy.deepcopy(self.flow_solver)
+        }
+    
+    def set_simulation_state(self, state):
+        """Restore state saved by get_simulation_state"""
+        self.particles = copy.deepcopy(state['particles'])
+        self.angle = state['angle']
+        self.time = state['time']
+        self.flow_solver = copy.deepcopy(state['flow_solver'])
+    
+    def step_simulation(self):
+        """Advance the simulation by one fixed timestep and publish the result"""
+        self.update_scene(self.get_substeps())
+        self.publish_state()
+        self.advance_animation()
+    
+    def consume_timesteps(self, accumulator):
+        """Run whole timesteps out of the accumulated time, returning the remainder"""
+        start_time = time.perf_counter()
+        while accumulator >= self.timestep:
+            with self.simulation_lock:
+                self.step_simulation()
+            accumulator -= self.timestep
             
-            # Get and draw wing geometry
-            wing_points = self.current_flap.get_flap_geometry(
-                self.width//2, self.height//2, self.flap_angle
-            )
-            pygame.draw.polygon(self.screen, self.WING_COLOR, wing_points)
+            # Steps can cost more than the time they simulate (e.g. with the
+            # lattice-Boltzmann field), so stop once the budget is spent and drop
+            # the time left over instead of spiralling
+            if time.perf_counter() - start_time > self.step_budget:
+                return accumulator if accumulator < self.timestep else 0.0
+        return accumulator
+    
+    def publish_state(self):
+        """Copy the drawable state into the back buffer and swap it to the front"""
+        back = self.render_buffers[1]
+        n_particles = len(self.particles)
+        if back is None or len(back['positions']) != n_particles:
+            back = {
+                'positions': np.empty((n_particles, 2)),
+                'velocities': np.empty((n_particles, 2)),
+                'temperatures': np.empty(n_particles),
+                'pressures': np.empty(n_particles)
+            }
+        
+        back['positions'][:] = [particle['pos'] for particle in self.particles]
+        back['velocities'][:] = [particle['velocity'] for particle in self.particles]
+        back['temperatures'][:] = [particle['temperature'] for particle in self.particles]
+        back['pressures'][:] = [particle['pressure'] for particle in self.particles]
+        back['wing_points'] = self.wing_points
+        back['trajectory_frame'] = self.trajectory_frame if self.trajectory is not None else None
+        
+        # The renderer only reads the front buffer while holding the lock
+        with self.buffer_lock:
+            self.render_buffers = [back, self.render_buffers[0]]
+    
+    def run_simulation_loop(self):
+        """Step the simulation at the fixed timestep until stopped"""
+        previous = time.perf_counter()
+        accumulator = 0.0
+        while self.simulation_running:
+            now = time.perf_counter()
+            accumulator = self.consume_timesteps(accumulator + now - previous)
+            previous = now
+            time.sleep(max(self.timestep - accumulator, 0))
+    
+    def start_simulation_thread(self):
+        """Run simulation stepping on a background thread"""
+        self.simulation_running = True
+        self.simulation_thread = threading.Thread(target=self.run_simulation_loop, daemon=True)
+        self.simulation_thread.start()
+    
+    def stop_simulation_thread(self):
+        """Stop the background simulation thread, if running"""
+        self.simulation_running = False
+        if self.simulation_thread is not None:
+            self.simulation_thread.join()
+            self.simulation_thread = None
+    
+    def render_frame(self):
+        """Draw the latest published state, returning the screen areas that changed"""
+        # Erase what was drawn last frame by restoring the cached background
+        for rect in self.dirty_rects:
+            self.screen.blit(self.background, rect, rect)
+        changed = list(self.dirty_rects) + self.update_ui_layer()
+        drawn = []
+        
+        with self.buffer_lock:
+            state = self.render_buffers[0]
+            if state is not None:
+                if state['trajectory_frame'] is not None:
+                    drawn.append(self.draw_force_readout(state['trajectory_frame']))
+                
+                # Draw wing geometry
+                drawn.append(pygame.draw.polygon(self.screen, self.WING_COLOR, state['wing_points']))
+                
+                # Draw airflow with thermal indicators
+                drawn.extend(self.draw_airflow(state))
+        
+        self.dirty_rects = drawn
+        return changed + drawn
+    
+    def prepare_scene(self, flap_types):
+        """Set up the UI layer and draw it in full before the first frame"""
+        self.create_ui_layer(flap_types)
+        self.current_flap = list(flap_types.values())[0]
+        
+        self.update_ui_layer()
+        self.screen.blit(self.background, (0, 0))
+        self.dirty_rects = []
+        self.render_buffers = [None, None]
+    
+    def run_visualization(self, flap_types, threaded=False):
+        """Run the interactive visualization
+        
+        The simulation advances in fixed timesteps regardless of frame rate; when
+        rendering falls behind, several steps run per drawn frame. With threaded,
+        stepping runs on a background thread and frames draw the latest state.
+        """
+        self.prepare_scene(flap_types)
+        pygame.display.flip()
+        if threaded:
+            self.start_simulation_thread()
+        
+        previous = time.perf_counter()
+        accumulator = 0.0
+        while self.running:
+            with self.simulation_lock:
+                self.handle_events(flap_types)
             
-            # Draw airflow with thermal indicators
-            self.draw_airflow(wing_points)
+            if not threaded:
+                now = time.perf_counter()
+                accumulator = self.consume_timesteps(accumulator + now - previous)
+                previous = now
             
-            # Update display
-            pygame.display.flip()
+            # Only push the regions that changed to the display
+            pygame.display.update(self.render_frame())
             self.clock.tick(60)
-            
-            # Update animation
-            self.angle = (self.angle + 1) % 360
-            self.time += 1/60
-            
+        
+        self.stop_simulation_thread()
         pygame.quit()
 
     def handle_events(self, flap_types):
@@ -276,6 +570,9 @@ class AerodynamicVisualizer:
                 self.running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 self.handle_button_click(event.pos, flap_types)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_f:
+                # Toggle the lattice-Boltzmann flow field
+                self.enable_flow_solver(self.flow_solver is None)
 
     def reset_simulation(self):
         """Reset simulation parameters to default values"""
@@ -285,6 +582,11 @@ class AerodynamicVisualizer:
         self.flap_angle = 0
         self.time = 0
         self.particles = self.create_particles()  # Reset particle positions
+        self.ui_dirty = True
+        
+        # Restart the flow field from uniform flow
+        if self.flow_solver is not None:
+            self.enable_flow_solver()
 
     def handle_button_click(self, pos, flap_types):
         """Handle button clicks for flap type selection and speed control"""
@@ -301,15 +603,13 @@ class AerodynamicVisualizer:
         elif self.speed_buttons['increase'].collidepoint(pos):
             self.update_airspeed(increase=True)
 
-    def draw_buttons(self):
+    def draw_buttons(self, surface):
         """Draw the flap type selection buttons"""
-        mouse_pos = pygame.mouse.get_pos()
-        
         for flap_type, button in self.buttons.items():
-            color = self.BUTTON_HOVER if button.collidepoint(mouse_pos) else self.BUTTON_COLOR
-            pygame.draw.rect(self.screen, color, button, border_radius=5)
+            color = self.BUTTON_HOVER if flap_type == self.hovered_button else self.BUTTON_COLOR
+            pygame.draw.rect(surface, color, button, border_radius=5)
             
-            font = pygame.font.Font(None, 24)
-            text = font.render(flap_type, True, self.TEXT_COLOR)
+            # Labels are rendered once when the buttons are created
+            text = self.button_labels[flap_type]
             text_rect = text.get_rect(center=button.center)
-            self.screen.blit(text, text_rect) 
\ No newline at end of file
+            surface.blit(text, text_rect)
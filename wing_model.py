@@ -21,37 +21,129 @@ class WingModel:
             'Gouge Flap': 1.4
         }
         
-    def calculate_forces(self, angle_of_attack, flap_type, reynolds_number):
-        """Calculate lift and drag coefficients for given conditions"""
-        # Convert angle to radians
-        alpha = np.radians(angle_of_attack)
+        # Parasitic drag multiplier for slotted flaps
+        self.slot_drag_factor = 1.1
         
-        # Basic lift coefficient calculation
-        cl = 2 * np.pi * alpha
+        # Skin-friction correlation ('laminar', 'transition' or 'turbulent')
+        self.friction_model = 'turbulent'
         
-        # Apply flap effectiveness factor
-        effectiveness = self.flap_effectiveness.get(flap_type, 1.0)
-        cl *= effectiveness
+        # Log-spaced Reynolds number table for skin-friction lookups
+        self.log_reynolds_table = np.linspace(np.log(1e3), np.log(1e10), 512)
+        self.friction_tables = {}
+        
+    def calculate_forces(self, angle_of_attack, flap_type, reynolds_number):
+        """Calculate lift and drag coefficients for given conditions"""
+        cl = self.calculate_lift(angle_of_attack, flap_type)
         
         # Calculate induced drag
-        aspect_ratio = self.get_aspect_ratio()
-        cd_induced = cl**2 / (np.pi * aspect_ratio * effectiveness)
+        cd_induced = self.calculate_induced_drag(cl, flap_type)
         
         # Calculate parasitic drag
         cd_parasitic = self.calculate_parasitic_drag(reynolds_number)
-        if flap_type in ['Slotted Flap', 'Double-Slotted Flap', 'Triple-Slotted Flap']:
-            cd_parasitic *= 1.1  # Additional drag due to slots
+        cd_parasitic *= self.get_slot_drag_factor(flap_type)
         
         # Total drag coefficient
         cd = cd_parasitic + cd_induced
         
         return cl, cd
     
+    def calculate_polars(self, angles_of_attack, flap_type, reynolds_numbers):
+        """Calculate lift and drag coefficients over a Reynolds number x angle grid"""
+        reynolds_numbers = np.atleast_1d(np.asarray(reynolds_numbers, dtype=float))
+        
+        # Lift and induced drag only depend on angle
+        cl = self.calculate_lift(np.asarray(angles_of_attack, dtype=float), flap_type)
+        cd_induced = self.calculate_induced_drag(cl, flap_type)
+        
+        # Parasitic drag only depends on Reynolds number
+        cd_parasitic = self.calculate_parasitic_drag(reynolds_numbers)
+        cd_parasitic *= self.get_slot_drag_factor(flap_type)
+        
+        cd = cd_parasitic[:, np.newaxis] + cd_induced[np.newaxis, :]
+        cl = np.repeat(cl[np.newaxis], len(reynolds_numbers), axis=0)
+        return cl, cd
+    
+    def calculate_lift(self, angle_of_attack, flap_type, effectiveness=None):
+        """Calculate lift coefficient from thin-airfoil theory and flap effectiveness
+        
+        effectiveness overrides the flap's factor, e.g. for partially deployed flaps.
+        """
+        # Convert angle to radians
+        alpha = np.radians(angle_of_attack)
+        
+        # Basic lift coefficient calculation
+        cl = 2 * np.pi * alpha
+        
+        # Apply flap effectiveness factor
+        if effectiveness is None:
+            effectiveness = self.flap_effectiveness.get(flap_type, 1.0)
+        return cl * effectiveness
+    
+    def calculate_induced_drag(self, cl, flap_type, effectiveness=None):
+        """Calculate induced drag coefficient for a given lift coefficient"""
+        if effectiveness is None:
+            effectiveness = self.flap_effectiveness.get(flap_type, 1.0)
+        aspect_ratio = self.get_aspect_ratio()
+        return cl**2 / (np.pi * aspect_ratio * effectiveness)
+    
+    def get_dependencies(self, flap_type, reynolds_number):
+        """Get the model parameters that a flap's polar depends on"""
+        return {
+            'effectiveness': self.flap_effectiveness.get(flap_type, 1.0),
+            'chord_length': self.chord_length,
+            'wingspan': self.wingspan,
+            'thickness_ratio': self.thickness_ratio,
+            'slot_drag_factor': self.get_slot_drag_factor(flap_type),
+            'friction_model': self.friction_model,
+            'reynolds_number': reynolds_number
+        }
+    
     def get_aspect_ratio(self):
         """Calculate wing aspect ratio"""
         return self.wingspan / self.chord_length
     
+    def get_slot_drag_factor(self, flap_type):
+        """Get the parasitic drag multiplier for slotted configurations"""
+        if flap_type in ['Slotted Flap', 'Double-Slotted Flap', 'Triple-Slotted Flap']:
+            return self.slot_drag_factor  # Additional drag due to slots
+        return 1.0
+    
+    def get_friction_table(self, model):
+        """Get the log skin-friction table for a correlation, building it on first use"""
+        if model not in self.friction_tables:
+            reynolds = np.exp(self.log_reynolds_table)
+            laminar = 1.328 / np.sqrt(reynolds)  # Blasius
+            turbulent = 0.074 / reynolds**0.2
+            
+            if model == 'laminar':
+                cf = laminar
+            elif model == 'transition':
+                # Prandtl-Schlichting, staying laminar below transition
+                cf = np.maximum(turbulent - 1700 / reynolds, laminar)
+            elif model == 'turbulent':
+                cf = turbulent
+            else:
+                raise ValueError(f"Unknown friction model: {model}")
+            
+            self.friction_tables[model] = np.log(cf)
+        return self.friction_tables[model]
+    
+    def calculate_skin_friction(self, reynolds_number):
+        """Interpolate flat-plate skin-friction coefficient from the Reynolds number table"""
+        table = self.get_friction_table(self.friction_model)
+        log_reynolds = np.log(reynolds_number)
+        log_cf = np.interp(log_reynolds, self.log_reynolds_table, table)
+        
+        # The correlations are power laws, so extend the end segments in log-log
+        # space rather than clamping outside the table
+        x = self.log_reynolds_table
+        low_slope = (table[1] - table[0]) / (x[1] - x[0])
+        high_slope = (table[-1] - table[-2]) / (x[-1] - x[-2])
+        log_cf = np.where(log_reynolds < x[0], table[0] + low_slope * (log_reynolds - x[0]), log_cf)
+        log_cf = np.where(log_reynolds > x[-1], table[-1] + high_slope * (log_reynolds - x[-1]), log_cf)
+        return np.exp(log_cf)
+    
     def calculate_parasitic_drag(self, reynolds_number):
         """Calculate parasitic drag coefficient using flat-plate friction correlation"""
-        cf = 0.074 / reynolds_number**0.2  # Turbulent flow correlation
-        return cf * (1 + 2 * self.thickness_ratio)
\ No newline at end of file
+        cf = self.calculate_skin_friction(reynolds_number)
+        return cf * (1 + 2 * self.thickness_ratio)